@@ -8,7 +8,14 @@ them from both ABS and disk. Intended to run as a cron job.
 Podcasts/Audiobooks with a "KEEP" tag will be skipped entirely.
 
 Usage:
-    ./abs-cleanup-finished-episodes-v4.py
+    ./abs-cleanup-finished-episodes-v4.py [--daemon] [--interval MINUTES] [--listen] [--no-compress]
+
+    --daemon    Keep running and clean up every --interval minutes instead of exiting
+                after one pass. The HTTP session, library list and podcast structure are
+                kept warm between cycles.
+    --listen    Stay connected to the ABS socket and delete each episode/audiobook as soon
+                as it is marked finished (requires python-socketio). No library scans.
+    --no-compress  Ask ABS for uncompressed responses (same as ABS_COMPRESS=0).
 
 Environment variables:
     ABS_URL     - Base URL of your Audiobookshelf instance
@@ -20,6 +27,52 @@ Environment variables:
     AGE         - Optional minimum age filter. Only delete items added to library at least this long ago.
                   Format: number + suffix (d=days, w=weeks, m=months, y=years)
                   Examples: 5d (5 days), 4w (4 weeks), 3m (3 months), 1y (1 year)
+    ABS_CONCURRENCY - Number of item detail requests to run in parallel (default: 4)
+    AUDIOBOOK_LOOKUP - How to find finished audiobooks: DIRECT fetches only the finished items,
+                  SCAN lists every book library first (default: DIRECT)
+    DELETE_CONCURRENCY - Number of podcasts to delete episodes from in parallel; episodes of one
+                  podcast are always deleted one at a time (default: ABS_CONCURRENCY)
+    DELETE_BATCH_SIZE - Number of audiobooks deleted per batch-delete request (default: 50)
+    SLIM_FETCH  - Set to 0 to fetch podcasts in full expanded form instead of the lighter
+                  non-expanded form (default: 1)
+    SERVER_FILTER - Set to 1 to have ABS filter library listings down to finished/in-progress
+                  items (minified) instead of listing everything
+    ITEM_CACHE_PATH - Optional SQLite file caching each podcast's episode list; podcasts are only
+                  re-fetched when their updatedAt changes (e.g. ~/.cache/abs-cleanup/items.db)
+    ITEM_CACHE_MAX_ITEMS - Maximum number of podcasts kept in the item cache (default: 5000)
+    HTTP_CACHE_PATH - Optional SQLite file storing GET responses with their ETag/Last-Modified;
+                  unchanged responses are revalidated (304) instead of downloaded again
+    STATE_PATH  - Optional SQLite file remembering finished items already handled; later runs
+                  only look at progress that is new or changed since then (delta mode)
+    MULTI_USER  - Set to 1 to combine the finished media of every user account instead of only the
+                  token's own (requires an admin API token)
+    MULTI_USER_POLICY - ANY deletes media finished by any of the users, ALL only media finished by
+                  all of them (default: ANY)
+    MULTI_USER_NAMES - Optional comma-separated usernames; only these users are combined
+    ABS_RETRIES - Times a request is retried after a connection error or 429/5xx reply (default: 3)
+    ABS_BACKOFF - Base delay in seconds between retries, doubled on every retry (default: 1).
+                  A Retry-After header from the server takes precedence.
+    BREAKER_THRESHOLD - Failed requests in a row after which all requests pause for
+                  BREAKER_COOLDOWN seconds; 0 disables the pause (default: 5)
+    BREAKER_COOLDOWN - Seconds to pause requests when ABS looks overloaded (default: 30)
+    ABS_MAX_RPS - Optional cap on requests per second sent to ABS (e.g. 5, or 0.5)
+    ABS_ADAPTIVE - Set to 1 to adapt the number of requests in flight (up to ABS_CONCURRENCY) to
+                  ABS's latency and error rate, backing off when the server slows down
+    ABS_POOL_SIZE - Connections kept open to ABS for reuse (default: the larger of ABS_CONCURRENCY
+                  and DELETE_CONCURRENCY)
+    ABS_CONNECT_TIMEOUT - Seconds to wait for a connection to ABS (default: 10)
+    ABS_READ_TIMEOUT - Seconds to wait for ABS to answer before the request is given up or retried
+                  (default: 120)
+    ABS_HTTP2   - Set to 1 to multiplex requests over a single HTTP/2 connection, e.g. through a reverse
+                  proxy (requires httpx[http2]; falls back to HTTP/1.1 without it)
+    ABS_COMPRESS - Set to 0 to ask for uncompressed responses, e.g. on CPU-starved hosts (default: 1).
+                  gzip/deflate are always offered, br/zstd when brotli/zstandard are installed.
+    DAEMON      - Set to 1 to run in daemon mode (same as --daemon)
+    DAEMON_INTERVAL - Minutes between cleanups in daemon mode (default: 60)
+    ABS_SOCKET_URL - Optional server to use for --listen instead of ABS_URL (e.g. a test server)
+    ABS_ASYNC   - Set to 1 to run on the asyncio pipeline (requires aiohttp). Raise ABS_CONCURRENCY
+                  to keep more requests in flight, and use ABS_MAX_RPS/ABS_ADAPTIVE to protect a
+                  small server. Retries, caches, HTTP/2 and the delete tuning settings don't apply.
 
 Pass the env variables first when running using bash/zsh etc:
     DRY_RUN=1 ABS_URL="https://my_server:13378/audiobookshelf" ABS_TOKEN="my_api_key" MEDIA_TYPE=EVERYTHING VERIFY_SSL=0 python3 ./abs-cleanup-finished-episodes-v4.py
@@ -34,9 +87,37 @@ Example cron (daily at 3am):
 import os
 import sys
 import re
+import json
+import time
+import random
+import signal
+import socket
+import argparse
+import base64
+import hashlib
+import sqlite3
+import asyncio
+import importlib.util
 import logging
+import threading
+import urllib3
 import requests
-from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import httpx
+    import h2  # httpx's HTTP/2 support
+except ImportError:
+    httpx = None
 
 # Configure logging
 log_level = logging.DEBUG if os.environ.get('DEBUG', '').lower() in ('1', 'true', 'yes') else logging.INFO
@@ -46,6 +127,40 @@ logging.basicConfig(
     datefmt='%Y-%m-%d %H:%M:%S'
 )
 logger = logging.getLogger(__name__)
+if log_level > logging.DEBUG:
+    # httpx logs every request at INFO
+    logging.getLogger('httpx').setLevel(logging.WARNING)
+
+DEFAULT_CONCURRENCY = 4
+BATCH_GET_SIZE = 100
+DEFAULT_DELETE_BATCH_SIZE = 50
+LIBRARY_PAGE_SIZE = 500
+PODCAST_PROGRESS_FILTERS = ('finished', 'in-progress')
+MULTI_USER_POLICIES = ('ANY', 'ALL')
+ASYNC_UNSUPPORTED_SETTINGS = ('AUDIOBOOK_LOOKUP', 'DELETE_BATCH_SIZE', 'DELETE_CONCURRENCY', 'ITEM_CACHE_PATH',
+                              'ITEM_CACHE_MAX_ITEMS', 'HTTP_CACHE_PATH', 'ABS_RETRIES', 'ABS_BACKOFF',
+                              'BREAKER_THRESHOLD', 'BREAKER_COOLDOWN', 'ABS_POOL_SIZE', 'ABS_HTTP2')
+DEFAULT_ITEM_CACHE_MAX_ITEMS = 5000
+HTTP_CACHE_MAX_ENTRIES = 5000
+STREAM_CHUNK_SIZE = 64 * 1024
+DEFAULT_DAEMON_INTERVAL_MINUTES = 60
+LIBRARY_CACHE_TTL = 60 * 60
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 1.0
+MAX_BACKOFF = 60
+MAX_RETRY_AFTER = 5 * 60
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+DEFAULT_BREAKER_THRESHOLD = 5
+DEFAULT_BREAKER_COOLDOWN = 30
+BREAKER_MAX_OUTAGE = 10 * 60
+ADAPTIVE_WINDOW = 20
+ADAPTIVE_MAX_ERROR_RATE = 0.1
+ADAPTIVE_LATENCY_FACTOR = 2.0
+DEFAULT_CONNECT_TIMEOUT = 10
+DEFAULT_READ_TIMEOUT = 120
+TCP_KEEPALIVE_IDLE = 60
+TCP_KEEPALIVE_INTERVAL = 15
+TCP_KEEPALIVE_COUNT = 4
 
 
 def parse_age(age_str: str) -> timedelta | None:
@@ -85,6 +200,70 @@ def parse_age(age_str: str) -> timedelta | None:
     return None
 
 
+def progress_filter(value: str) -> str:
+    """
+    Build an ABS library items filter on the user's progress.
+
+    Args:
+        value: Progress state, e.g. 'finished' or 'in-progress'
+
+    Returns:
+        Filter expression for the items endpoint's `filter` parameter
+    """
+    return 'progress.' + base64.b64encode(value.encode()).decode()
+
+
+def library_items_params(page: int, page_size: int, item_filter: str = None, minified: bool = False) -> dict:
+    """Build query parameters for one page of a library items listing."""
+    params = {'limit': str(page_size), 'page': str(page)}
+    if item_filter:
+        params['filter'] = item_filter
+    if minified:
+        params['minified'] = '1'
+    return params
+
+
+def select_json_decoder() -> tuple[str, callable]:
+    """
+    Pick the fastest installed JSON decoder.
+
+    Returns:
+        tuple of (backend_name, loads_function); orjson or ujson when
+        installed, otherwise the standard library json module
+    """
+    try:
+        import orjson
+        return 'orjson', orjson.loads
+    except ImportError:
+        pass
+
+    try:
+        import ujson
+        return 'ujson', ujson.loads
+    except ImportError:
+        pass
+
+    return 'json', json.loads
+
+
+def endpoint_key(endpoint: str) -> str:
+    """Collapse IDs in an API path so stats group per endpoint, e.g. /api/items/{id}."""
+    return re.sub(r'/(items|libraries|podcasts|episode|users)/(?!batch/)[^/]+', r'/\1/{id}', endpoint)
+
+
+def age_cutoff_ms(min_age: timedelta) -> int:
+    """
+    Compute the age filter cutoff for this run.
+
+    Args:
+        min_age: Minimum age as a timedelta
+
+    Returns:
+        Epoch milliseconds; items added at or before this are old enough
+    """
+    return int((time.time() - min_age.total_seconds()) * 1000)
+
+
 def is_old_enough(added_at_ms: int, min_age: timedelta) -> bool:
     """
     Check if an item is old enough based on when it was added.
@@ -100,36 +279,794 @@ def is_old_enough(added_at_ms: int, min_age: timedelta) -> bool:
         # If no addedAt timestamp, assume it's old enough (conservative approach)
         return True
 
-    added_at = datetime.fromtimestamp(added_at_ms / 1000)
-    age = datetime.now() - added_at
+    return added_at_ms <= age_cutoff_ms(min_age)
+
+
+def split_by_age(candidates: list, added_at_ms: list, cutoff_ms: int) -> tuple[list, list]:
+    """
+    Split candidates into those old enough and those too recent, in one pass.
+
+    Candidates without an addedAt timestamp count as old enough, as in
+    is_old_enough.
+
+    Args:
+        candidates: Items to split
+        added_at_ms: addedAt timestamp (or None) for each candidate
+        cutoff_ms: Cutoff from age_cutoff_ms
+
+    Returns:
+        tuple of (old_enough, too_recent) lists
+    """
+    old_enough = []
+    too_recent = []
+    for candidate, added_at in zip(candidates, added_at_ms):
+        (old_enough if not added_at or added_at <= cutoff_ms else too_recent).append(candidate)
+    return old_enough, too_recent
+
+
+def retry_after_seconds(response: requests.Response) -> float | None:
+    """Get the delay a response's Retry-After header asks for (seconds or HTTP date), capped."""
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        seconds = (retry_at - datetime.now(timezone.utc)).total_seconds()
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER)
+
+
+def format_added_at(added_at_ms: int | None) -> str:
+    """Format an addedAt timestamp as a date for log messages."""
+    if not added_at_ms:
+        return "unknown"
+    return datetime.fromtimestamp(added_at_ms / 1000).strftime('%Y-%m-%d')
+
+
+class Podcast:
+    """A podcast show, shared by all of its EpisodeRecords."""
+
+    __slots__ = ('library_item_id', 'title')
+
+    def __init__(self, library_item_id: str, title: str):
+        self.library_item_id = library_item_id
+        self.title = title
+
+
+class EpisodeRecord:
+    """A compact episode map entry; the podcast is referenced rather than copied."""
+
+    __slots__ = ('episode_id', 'podcast', 'episode_title', 'added_at')
+
+    def __init__(self, episode_id: str, podcast: Podcast, episode_title: str, added_at: int | None):
+        self.episode_id = episode_id
+        self.podcast = podcast
+        self.episode_title = episode_title
+        self.added_at = added_at
+
+    @property
+    def library_item_id(self) -> str:
+        return self.podcast.library_item_id
+
+    @property
+    def podcast_title(self) -> str:
+        return self.podcast.title
+
+
+class HTTPCache:
+    """
+    On-disk SQLite store of GET response bodies with their validators.
+
+    Lets ABSClient revalidate with If-None-Match/If-Modified-Since and reuse
+    the stored body when the server answers 304 Not Modified. The least
+    recently used entries are evicted beyond max_entries.
+    """
+
+    def __init__(self, path: str, max_entries: int = HTTP_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.revalidated = 0
+        self.stored = 0
+        self.lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            ' key TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, body BLOB NOT NULL, last_used REAL NOT NULL)'
+        )
+
+    @staticmethod
+    def key(namespace: str, url: str, params: dict = None) -> str:
+        """Build the cache key for a request; namespace separates API tokens."""
+        query = '&'.join(f'{k}={v}' for k, v in sorted((params or {}).items()))
+        return hashlib.sha256(f'{namespace} {url}?{query}'.encode()).hexdigest()
+
+    def get(self, key: str) -> tuple | None:
+        """Return (etag, last_modified, body) for a key, or None."""
+        with self.lock:
+            return self.db.execute(
+                'SELECT etag, last_modified, body FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+
+    def touch(self, key: str):
+        """Mark a stored response as revalidated and recently used."""
+        with self.lock:
+            self.revalidated += 1
+            self.db.execute('UPDATE responses SET last_used = ? WHERE key = ?', (time.time(), key))
+
+    def put(self, key: str, etag: str | None, last_modified: str | None, body: bytes):
+        """Store a response body with its validators."""
+        with self.lock:
+            self.stored += 1
+            self.db.execute(
+                'INSERT OR REPLACE INTO responses (key, etag, last_modified, body, last_used) VALUES (?, ?, ?, ?, ?)',
+                (key, etag, last_modified, body, time.time())
+            )
+
+    def flush(self):
+        """Evict least recently used entries beyond max_entries and save."""
+        with self.lock:
+            self.db.execute(
+                'DELETE FROM responses WHERE key NOT IN (SELECT key FROM responses ORDER BY last_used DESC LIMIT ?)',
+                (self.max_entries,)
+            )
+            self.db.commit()
+
+    def close(self):
+        """Flush, then close the cache file."""
+        self.flush()
+        with self.lock:
+            self.db.close()
+
+
+class ProgressFetchError(Exception):
+    """Raised when a cleanup pass can't fetch user progress, e.g. because the token was rejected."""
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised instead of sending a request while ABS is known to be down."""
+
+
+class CircuitBreaker:
+    """
+    Pauses all requests to ABS after too many failed attempts in a row.
+
+    After `threshold` consecutive failures the breaker opens and wait()
+    holds every request back for `cooldown` seconds. Requests then resume:
+    the first success closes the breaker, another failure opens it again.
+    Once ABS has been failing for BREAKER_MAX_OUTAGE, requests arriving while
+    the breaker is open fail with CircuitOpenError instead of waiting.
+    """
+
+    def __init__(self, threshold: int = DEFAULT_BREAKER_THRESHOLD, cooldown: float = DEFAULT_BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.trips = 0
+        self._failures = 0
+        self._open_until = None
+        self._outage_started = None
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Block while the breaker is open."""
+        with self._lock:
+            if self._open_until is None:
+                return
+            now = time.monotonic()
+            remaining = self._open_until - now
+            if remaining <= 0:
+                return
+            if now - self._outage_started > BREAKER_MAX_OUTAGE:
+                raise CircuitOpenError(f"ABS has been failing for over {BREAKER_MAX_OUTAGE // 60} minutes")
+        time.sleep(remaining)
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            if self._open_until is not None:
+                logger.info("ABS is responding again, resuming requests")
+                self._open_until = None
+                self._outage_started = None
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._failures < self.threshold:
+                return
+            now = time.monotonic()
+            if self._open_until is None:
+                self.trips += 1
+                self._outage_started = now
+                logger.warning(f"ABS looks overloaded ({self._failures} failed requests in a row), "
+                               f"pausing requests for {self.cooldown}s")
+            self._open_until = now + self.cooldown
+
+
+class Throttle:
+    """
+    Keeps the cleanup from crowding out real listeners on the same ABS server.
+
+    A token bucket holds requests to max_rps per second (bursts of up to one
+    second's worth); None means no cap. With adaptive=True the number of
+    requests in flight is also limited, AIMD style: the limit starts at half
+    of max_concurrency. After every ADAPTIVE_WINDOW requests it grows by one
+    while p95 latency and the error rate hold steady. It is halved when the
+    window's p95 exceeds ADAPTIVE_LATENCY_FACTOR times the best p95 seen, or
+    more than ADAPTIVE_MAX_ERROR_RATE of its requests failed.
+    """
+
+    def __init__(self, max_rps: float = None, max_concurrency: int = DEFAULT_CONCURRENCY, adaptive: bool = False):
+        self.max_rps = max_rps
+        self.max_concurrency = max_concurrency
+        self.adaptive = adaptive
+        self.limit = max(1, max_concurrency // 2) if adaptive else max_concurrency
+        self.lowest_limit = self.highest_limit = self.limit
+        self.requests = 0
+        self.last_p95 = None
+        self._best_p95 = None
+        self._in_flight = 0
+        self._window = []
+        self._window_errors = 0
+        self._limit_changed = 0.0
+        self._tokens = float(max(1.0, max_rps or 0))
+        self._tokens_updated = time.monotonic()
+        self._cond = threading.Condition()
+
+    def acquire(self) -> float:
+        """Wait for a free slot and a token; returns the start time to pass to release()."""
+        with self._cond:
+            if self.adaptive:
+                while self._in_flight >= self.limit:
+                    self._cond.wait()
+            self._in_flight += 1
+            wait = self._reserve_token()
+        if wait:
+            time.sleep(wait)
+        return time.monotonic()
+
+    def release(self, started: float, failed: bool):
+        """Record a finished request's latency and outcome, adapting the limit."""
+        with self._cond:
+            self._record(started, failed)
+            self._cond.notify_all()
+
+    def reset_stats(self):
+        """Start counting requests and the limit's range afresh; the limit itself is kept."""
+        self.requests = 0
+        self.lowest_limit = self.highest_limit = self.limit
+        self.last_p95 = None
+
+    def _reserve_token(self) -> float:
+        """Take a token from the bucket, returning how long to wait before sending."""
+        if not self.max_rps:
+            return 0.0
+        # Tokens may go negative: each caller reserves the next free send time
+        now = time.monotonic()
+        self._tokens = min(max(1.0, self.max_rps), self._tokens + (now - self._tokens_updated) * self.max_rps)
+        self._tokens_updated = now
+        self._tokens -= 1
+        return -self._tokens / self.max_rps if self._tokens < 0 else 0.0
+
+    def _record(self, started: float, failed: bool):
+        self._in_flight -= 1
+        self.requests += 1
+        # Requests sent before the last limit change say nothing about the new limit
+        if started >= self._limit_changed:
+            self._window.append(time.monotonic() - started)
+            if failed:
+                self._window_errors += 1
+            if len(self._window) >= ADAPTIVE_WINDOW:
+                self._adapt()
+
+    def _adapt(self):
+        self._window.sort()
+        p95 = self._window[int(len(self._window) * 0.95) - 1]
+        error_rate = self._window_errors / len(self._window)
+        self._window = []
+        self._window_errors = 0
+        self.last_p95 = p95
+
+        if not self.adaptive:
+            return
+        if self._best_p95 is None or p95 < self._best_p95:
+            self._best_p95 = p95
+
+        if error_rate > ADAPTIVE_MAX_ERROR_RATE or p95 > self._best_p95 * ADAPTIVE_LATENCY_FACTOR:
+            new_limit = max(1, self.limit // 2)
+        else:
+            new_limit = min(self.max_concurrency, self.limit + 1)
+        if new_limit != self.limit:
+            logger.debug(f"Concurrency limit {self.limit} -> {new_limit} "
+                         f"(p95 {p95 * 1000:.0f} ms, {error_rate:.0%} errors)")
+            self.limit = new_limit
+            self._limit_changed = time.monotonic()
+            self.lowest_limit = min(self.lowest_limit, new_limit)
+            self.highest_limit = max(self.highest_limit, new_limit)
+
+
+class AsyncThrottle(Throttle):
+    """Throttle for AsyncABSClient: the same rate cap and AIMD limit, waiting with asyncio."""
+
+    def __init__(self, max_rps: float = None, max_concurrency: int = DEFAULT_CONCURRENCY, adaptive: bool = False):
+        super().__init__(max_rps, max_concurrency, adaptive)
+        self._cond = asyncio.Condition()
+
+    async def acquire(self) -> float:
+        async with self._cond:
+            if self.adaptive:
+                await self._cond.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+            wait = self._reserve_token()
+        if wait:
+            await asyncio.sleep(wait)
+        return time.monotonic()
+
+    async def release(self, started: float, failed: bool):
+        async with self._cond:
+            self._record(started, failed)
+            self._cond.notify_all()
+
+
+class KeepAliveAdapter(HTTPAdapter):
+    """HTTPAdapter whose connections use TCP keep-alive, so idle pooled sockets to ABS are kept open."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        options = list(urllib3.connection.HTTPConnection.default_socket_options)
+        options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+        # Probe timings are only tunable on some platforms (e.g. Linux)
+        for name, value in (('TCP_KEEPIDLE', TCP_KEEPALIVE_IDLE), ('TCP_KEEPINTVL', TCP_KEEPALIVE_INTERVAL),
+                            ('TCP_KEEPCNT', TCP_KEEPALIVE_COUNT)):
+            if hasattr(socket, name):
+                options.append((socket.IPPROTO_TCP, getattr(socket, name), value))
+        kwargs['socket_options'] = options
+        super().init_poolmanager(*args, **kwargs)
+
+
+class PoolFullCounter(logging.Filter):
+    """
+    Counts urllib3's "Connection pool is full" warnings.
+
+    urllib3 only reports a connection discarded because the pool was too
+    small through its logger, so this filter is attached there.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if isinstance(record.msg, str) and record.msg.startswith('Connection pool is full'):
+            with self._lock:
+                self.count += 1
+        return True
+
 
-    return age >= min_age
+class HTTPXBody:
+    """File-like view of a streamed httpx response body, usable as requests.Response.raw."""
+
+    def __init__(self, response):
+        self.response = response
+        self._chunks = response.iter_bytes()
+        self._buffer = b''
+
+    def read(self, size: int = -1) -> bytes:
+        while size < 0 or len(self._buffer) < size:
+            try:
+                chunk = next(self._chunks)
+            except StopIteration:
+                break
+            except httpx.TimeoutException as e:
+                raise requests.exceptions.ReadTimeout(e) from e
+            except httpx.TransportError as e:
+                raise requests.exceptions.ConnectionError(e) from e
+            self._buffer += chunk
+
+        if size < 0:
+            data, self._buffer = self._buffer, b''
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def tell(self) -> int:
+        """Bytes received on the wire so far, before decompression (like urllib3's tell())."""
+        return self.response.num_bytes_downloaded
+
+    def close(self):
+        self.response.close()
+
+
+class HTTP2Transport:
+    """
+    Sends ABSClient's requests with httpx, multiplexed over HTTP/2.
+
+    Concurrent requests share one connection to the server instead of a
+    pool of HTTP/1.1 connections; servers or proxies that don't offer
+    HTTP/2 are spoken to over HTTP/1.1 by the same client. Responses are
+    converted to requests.Response, and httpx errors to their requests
+    equivalents, so the rest of ABSClient doesn't see the difference.
+    """
+
+    def __init__(self, headers: dict, verify_ssl: bool, timeout: tuple, pool_size: int):
+        connect_timeout, read_timeout = timeout
+        self.client = httpx.Client(
+            http2=True,
+            headers=headers,
+            verify=verify_ssl,
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+        )
+        self.http_versions = {}
+        self._lock = threading.Lock()
+
+    def request(self, method: str, url: str, params: dict = None, headers: dict = None, json: dict = None,
+                stream: bool = False) -> requests.Response:
+        try:
+            request = self.client.build_request(method, url, params=params, headers=headers, json=json)
+            response = self.client.send(request, stream=stream)
+        except httpx.ConnectTimeout as e:
+            raise requests.exceptions.ConnectTimeout(e) from e
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.ReadTimeout(e) from e
+        except httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(e) from e
+
+        with self._lock:
+            self.http_versions[response.http_version] = self.http_versions.get(response.http_version, 0) + 1
+
+        converted = requests.Response()
+        converted.status_code = response.status_code
+        converted.reason = response.reason_phrase
+        converted.headers = requests.structures.CaseInsensitiveDict(response.headers)
+        converted.url = str(response.url)
+        converted.raw = HTTPXBody(response)
+        return converted
+
+    def close(self):
+        """Close the httpx client and its connections."""
+        self.client.close()
 
 
 class ABSClient:
-    def __init__(self, base_url: str, token: str, verify_ssl: bool = True):
+    def __init__(self, base_url: str, token: str, verify_ssl: bool = True, http_cache: HTTPCache = None,
+                 retries: int = DEFAULT_RETRIES, backoff: float = DEFAULT_BACKOFF, breaker: CircuitBreaker = None,
+                 throttle: Throttle = None, pool_size: int = DEFAULT_CONCURRENCY,
+                 timeout: tuple = (DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT), http2: bool = False,
+                 compress: bool = True):
         self.base_url = base_url.rstrip('/')
         self.verify_ssl = verify_ssl
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self._connections_before = 0
+        self.http_cache = http_cache
+        self.retries = retries
+        self.backoff = backoff
+        self.breaker = breaker
+        self.throttle = throttle
+        self.retried = 0
+        self.connection_errors = 0
+        self._http_cache_namespace = hashlib.sha256(token.encode()).hexdigest()
+
+        # JSON decoding backend, plus per-endpoint [count, seconds] decode timings
+        self.json_backend, self._json_loads = select_json_decoder()
+        self.decode_stats = {}
+        # Per-endpoint [responses, bytes on the wire, bytes decompressed]
+        self.transfer_stats = {}
+        self._stats_lock = threading.Lock()
+        # One pool for every library and phase of the run, sized to the worker count
         self.session = requests.Session()
-        self.session.headers.update({
+        self.adapter = KeepAliveAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('http://', self.adapter)
+        self.session.mount('https://', self.adapter)
+        self.pool_full = PoolFullCounter()
+        logging.getLogger('urllib3.connectionpool').addFilter(self.pool_full)
+        self.batch_get_supported = True
+        self.batch_delete_supported = True
+
+        # Per-run cache of GET responses, plus GETs currently in flight so
+        # identical concurrent requests share one round-trip
+        self._cache = {}
+        self._in_flight = {}
+        self._cache_generation = 0
+        self._cache_lock = threading.Lock()
+
+        headers = {
             'Authorization': f'Bearer {token}',
             'Content-Type': 'application/json'
-        })
+        }
+        self.session.headers.update(headers)
+
+        # Offer every encoding urllib3 can decode (gzip/deflate, plus br/zstd when
+        # brotli/zstandard are installed), or ask for uncompressed responses
+        self.session.headers['Accept-Encoding'] = (
+            urllib3.util.make_headers(accept_encoding=True)['accept-encoding'] if compress else 'identity'
+        )
+        if not compress:
+            # httpx negotiates its own supported encodings unless told otherwise
+            headers['Accept-Encoding'] = 'identity'
+
+        # Optional HTTP/2 transport used instead of the session
+        self.http2 = HTTP2Transport(headers, verify_ssl, timeout, pool_size) if http2 else None
 
         if not verify_ssl:
             # Suppress the InsecureRequestWarning
-            import urllib3
             urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
-    def _get(self, endpoint: str, params: dict = None) -> dict:
+    def _request(self, method: str, endpoint: str, **kwargs) -> requests.Response:
+        """
+        Send a request, retrying transient failures.
+
+        Connection errors and 429/5xx replies are retried up to `retries`
+        times, after the server's Retry-After delay or an exponential backoff
+        with jitter. POSTs are only retried when the server turned them away
+        (429/503), since a batch delete may not be safe to send twice.
+
+        Returns:
+            The final response, with `retried` set if an earlier attempt
+            failed; raise_for_status() is left to the caller
+        """
         url = f"{self.base_url}{endpoint}"
-        response = self.session.get(url, params=params, verify=self.verify_ssl)
+        idempotent = method != 'POST'
+        attempt = 0
+
+        while True:
+            if self.breaker is not None:
+                self.breaker.wait()
+
+            try:
+                response = self._send(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                with self._stats_lock:
+                    self.connection_errors += 1
+                if self.breaker is not None:
+                    self.breaker.record_failure()
+                if not idempotent or attempt >= self.retries:
+                    raise
+                reason = e
+                delay = None
+            else:
+                status = response.status_code
+                if self.breaker is not None:
+                    if status in RETRY_STATUSES:
+                        self.breaker.record_failure()
+                    else:
+                        self.breaker.record_success()
+                retryable = status in (429, 503) or (idempotent and status in RETRY_STATUSES)
+                if not retryable or attempt >= self.retries:
+                    response.retried = attempt > 0
+                    return response
+                reason = f"HTTP {status}"
+                delay = retry_after_seconds(response)
+                response.close()
+
+            if delay is None:
+                # Exponential backoff with jitter, so parallel workers don't retry in lockstep
+                ceiling = min(MAX_BACKOFF, self.backoff * 2 ** attempt)
+                delay = ceiling / 2 + random.uniform(0, ceiling / 2)
+            attempt += 1
+            with self._stats_lock:
+                self.retried += 1
+            logger.debug(f"{method} {endpoint} failed ({reason}), retry {attempt}/{self.retries} in {delay:.1f}s")
+            time.sleep(delay)
+
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a single request, through the throttle if there is one."""
+        if self.throttle is None:
+            return self._send_once(method, url, **kwargs)
+
+        started = self.throttle.acquire()
+        failed = True
+        try:
+            response = self._send_once(method, url, **kwargs)
+            failed = response.status_code in RETRY_STATUSES
+            return response
+        finally:
+            self.throttle.release(started, failed)
+
+    def _send_once(self, method: str, url: str, **kwargs) -> requests.Response:
+        if self.http2 is not None:
+            return self.http2.request(method, url, **kwargs)
+        return self.session.request(method, url, timeout=self.timeout, verify=self.verify_ssl, **kwargs)
+
+    @property
+    def connections_opened(self) -> int:
+        """Number of connections opened to ABS since reset_stats() (the rest of the requests reused one)."""
+        return self._connections_total() - self._connections_before
+
+    def _connections_total(self) -> int:
+        pools = self.adapter.poolmanager.pools
+        return sum(pools[key].num_connections for key in pools.keys())
+
+    def close(self):
+        """Close the session and HTTP/2 transport, releasing their connections."""
+        self.session.close()
+        if self.http2 is not None:
+            self.http2.close()
+        logging.getLogger('urllib3.connectionpool').removeFilter(self.pool_full)
+
+    def reset_stats(self):
+        """
+        Zero the request counters reported in the run summary.
+
+        The client outlives a single pass in daemon mode, so each pass
+        resets them to report its own figures.
+        """
+        with self._stats_lock:
+            self.retried = 0
+            self.connection_errors = 0
+            self.decode_stats = {}
+            self.transfer_stats = {}
+        self._connections_before = self._connections_total()
+        self.pool_full.count = 0
+        if self.breaker is not None:
+            self.breaker.trips = 0
+        if self.throttle is not None:
+            self.throttle.reset_stats()
+        if self.http2 is not None:
+            self.http2.http_versions = {}
+
+    def _get(self, endpoint: str, params: dict = None, cache: bool = False) -> dict:
+        """
+        GET an endpoint and return the decoded JSON.
+
+        Identical GETs running at the same time are coalesced into one request.
+        With cache=True the response is also kept for the rest of the run
+        (until invalidate_cache() is called).
+        """
+        key = (endpoint, tuple(sorted((params or {}).items())))
+
+        with self._cache_lock:
+            if key in self._cache:
+                return self._cache[key][1]
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._in_flight[key] = future
+            generation = self._cache_generation
+
+        if not owner:
+            return future.result()
+
+        try:
+            data = self._decode(endpoint, self._fetch(endpoint, params))
+        except Exception as e:
+            with self._cache_lock:
+                self._in_flight.pop(key, None)
+            future.set_exception(e)
+            raise
+
+        with self._cache_lock:
+            # Don't cache a response that was in flight while the cache was invalidated
+            if cache and generation == self._cache_generation:
+                self._cache[key] = (time.monotonic(), data)
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+        future.set_result(data)
+        return data
+
+    def _decode(self, endpoint: str, body: bytes):
+        """Decode a JSON body with the selected backend, recording the time taken."""
+        start = time.perf_counter()
+        data = self._json_loads(body)
+        elapsed = time.perf_counter() - start
+
+        with self._stats_lock:
+            stats = self.decode_stats.setdefault(endpoint_key(endpoint), [0, 0.0])
+            stats[0] += 1
+            stats[1] += elapsed
+        return data
+
+    def _record_transfer(self, endpoint: str, response: requests.Response, size: int):
+        """Record a fully read response's size on the wire and after decompression."""
+        with self._stats_lock:
+            stats = self.transfer_stats.setdefault(endpoint_key(endpoint), [0, 0, 0])
+            stats[0] += 1
+            stats[1] += response.raw.tell()
+            stats[2] += size
+
+    def _fetch(self, endpoint: str, params: dict = None) -> bytes:
+        """
+        GET an endpoint and return the raw response body.
+
+        With an HTTP cache, the request carries the stored validators and a
+        304 Not Modified reply is answered from the stored body.
+        """
+        headers = {}
+        cache_key = None
+        cached = None
+
+        if self.http_cache is not None:
+            cache_key = HTTPCache.key(self._http_cache_namespace, f"{self.base_url}{endpoint}", params)
+            cached = self.http_cache.get(cache_key)
+            if cached is not None:
+                etag, last_modified, _ = cached
+                if etag:
+                    headers['If-None-Match'] = etag
+                if last_modified:
+                    headers['If-Modified-Since'] = last_modified
+
+        response = self._request('GET', endpoint, params=params, headers=headers)
+
+        if cached is not None and response.status_code == 304:
+            self.http_cache.touch(cache_key)
+            return cached[2]
+
         response.raise_for_status()
-        return response.json()
+        body = response.content
+        self._record_transfer(endpoint, response, len(body))
 
-    def _delete(self, endpoint: str, params: dict = None) -> requests.Response:
-        url = f"{self.base_url}{endpoint}"
-        response = self.session.delete(url, params=params, verify=self.verify_ssl)
+        if cache_key is not None:
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            if etag or last_modified:
+                self.http_cache.put(cache_key, etag, last_modified, body)
+
+        return body
+
+    def invalidate_cache(self, older_than: float = None):
+        """
+        Drop cached GET responses, e.g. after the server's data changed.
+
+        Args:
+            older_than: If given, only drop responses cached more than this
+                        many seconds ago; otherwise drop everything
+        """
+        with self._cache_lock:
+            if older_than is not None:
+                cutoff = time.monotonic() - older_than
+                for key in [key for key, (cached_at, _) in self._cache.items() if cached_at < cutoff]:
+                    del self._cache[key]
+                return
+
+            self._cache.clear()
+            self._in_flight.clear()
+            self._cache_generation += 1
+
+    def invalidate_library_items(self, library_item_ids):
+        """
+        Drop cached GET responses that a change to these library items can affect.
+
+        That is the items themselves and any library listing; the library
+        list itself is kept.
+        """
+        endpoints = {f'/api/items/{library_item_id}' for library_item_id in library_item_ids}
+
+        def affected(key):
+            endpoint = key[0]
+            return endpoint in endpoints or endpoint.startswith('/api/libraries/')
+
+        with self._cache_lock:
+            for key in [key for key in self._cache if affected(key)]:
+                del self._cache[key]
+            for key in [key for key in self._in_flight if affected(key)]:
+                del self._in_flight[key]
+            self._cache_generation += 1
+
+    def _post(self, endpoint: str, json: dict = None, params: dict = None) -> requests.Response:
+        response = self._request('POST', endpoint, json=json, params=params)
+        response.raise_for_status()
+        return response
+
+    def _delete(self, endpoint: str, library_item_id: str, params: dict = None) -> requests.Response:
+        """DELETE an endpoint that changes the given library item."""
+        try:
+            response = self._request('DELETE', endpoint, params=params)
+        finally:
+            self.invalidate_library_items([library_item_id])
+        if response.status_code == 404 and response.retried:
+            # An earlier attempt that timed out or failed may have gone through
+            logger.debug(f"DELETE {endpoint} returned 404 on retry, treating it as already deleted")
+            return response
         response.raise_for_status()
         return response
 
@@ -137,9 +1074,56 @@ class ABSClient:
         """Get current user info including media progress."""
         return self._get('/api/me')
 
+    def get_users(self) -> list:
+        """Get all user accounts (admin token required). Progress is not included."""
+        data = self._get('/api/users')
+        return data.get('users', [])
+
+    def get_user(self, user_id: str) -> dict:
+        """Get one user including their media progress (admin token required)."""
+        return self._get(f'/api/users/{user_id}')
+
+    def iter_finished_progress(self):
+        """
+        Iterate over the current user's finished mediaProgress records.
+
+        With ijson installed, /api/me is parsed incrementally as it downloads
+        and only finished records are ever kept. Without ijson, or when an
+        HTTP cache is in use (so the response can be revalidated), the whole
+        document is fetched and filtered instead.
+
+        Yields:
+            mediaProgress dicts with isFinished set
+        """
+        if ijson is None or self.http_cache is not None:
+            for progress in self.get_user_with_progress().get('mediaProgress', []):
+                if progress.get('isFinished'):
+                    yield progress
+            return
+
+        with self._request('GET', '/api/me', stream=True) as response:
+            response.raise_for_status()
+
+            records = ijson.sendable_list()
+            parser = ijson.items_coro(records, 'mediaProgress.item', use_float=True)
+            size = 0
+            for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                size += len(chunk)
+                parser.send(chunk)
+                for progress in records:
+                    if progress.get('isFinished'):
+                        yield progress
+                del records[:]
+            parser.close()
+            self._record_transfer('/api/me', response, size)
+
+            for progress in records:
+                if progress.get('isFinished'):
+                    yield progress
+
     def get_libraries(self) -> list:
         """Get all libraries."""
-        data = self._get('/api/libraries')
+        data = self._get('/api/libraries', cache=True)
         return data.get('libraries', [])
 
     def get_podcast_libraries(self) -> list:
@@ -150,15 +1134,68 @@ class ABSClient:
         """Get only book-type libraries (audiobooks)."""
         return [lib for lib in self.get_libraries() if lib.get('mediaType') == 'book']
 
-    def get_library_items(self, library_id: str) -> list:
-        """Get all items in a library."""
-        data = self._get(f'/api/libraries/{library_id}/items')
-        return data.get('results', [])
+    def get_library_items(self, library_id: str, item_filter: str = None, minified: bool = False) -> list:
+        """Get all items in a library, optionally filtered server-side."""
+        return list(self.iter_library_items(library_id, item_filter=item_filter, minified=minified))
+
+    def iter_library_items(self, library_id: str, page_size: int = LIBRARY_PAGE_SIZE,
+                           item_filter: str = None, minified: bool = False):
+        """
+        Iterate over all items in a library, one page at a time.
+
+        Only a single page of the listing is held in memory at once.
+
+        Args:
+            library_id: The library to list
+            page_size: Number of items to request per page
+            item_filter: Optional server-side filter expression (see progress_filter)
+            minified: If True, ask for the minified item representation
+
+        Yields:
+            Library item dicts
+        """
+        page = 0
+        seen = 0
+        while True:
+            data = self._get(f'/api/libraries/{library_id}/items',
+                             params=library_items_params(page, page_size, item_filter, minified))
+            results = data.get('results', [])
+            yield from results
+
+            seen += len(results)
+            if len(results) < page_size or seen >= data.get('total', 0):
+                return
+            page += 1
 
     def get_library_item(self, library_item_id: str) -> dict:
         """Get a single library item with full details including episodes."""
         return self._get(f'/api/items/{library_item_id}', params={'expanded': '1'})
 
+    def get_podcast_item_slim(self, library_item_id: str) -> dict:
+        """
+        Get a podcast with just the fields the episode map needs.
+
+        Asks for the plain (non-expanded) item, which skips the expanded audio
+        file and track details, and falls back to the expanded form if the
+        server leaves the episode list out. The result is projected down with
+        slim_podcast_item.
+        """
+        item = self._get(f'/api/items/{library_item_id}')
+        if 'episodes' not in item.get('media', {}):
+            item = self.get_library_item(library_item_id)
+        return slim_podcast_item(item)
+
+    def get_library_items_batch(self, library_item_ids: list) -> list:
+        """
+        Get several library items with full details in one request.
+
+        Uses the batch-get endpoint; IDs the server doesn't know are left out
+        of the result.
+        """
+        response = self._post('/api/items/batch/get', json={'libraryItemIds': list(library_item_ids)})
+        self._record_transfer('/api/items/batch/get', response, len(response.content))
+        return self._decode('/api/items/batch/get', response.content).get('libraryItems', [])
+
     def delete_episode(self, library_item_id: str, episode_id: str, hard_delete: bool = True) -> bool:
         """
         Delete a podcast episode.
@@ -172,7 +1209,7 @@ class ABSClient:
             True if successful
         """
         params = {'hard': '1'} if hard_delete else {}
-        self._delete(f'/api/podcasts/{library_item_id}/episode/{episode_id}', params=params)
+        self._delete(f'/api/podcasts/{library_item_id}/episode/{episode_id}', library_item_id, params=params)
         return True
 
     def delete_library_item(self, library_item_id: str, hard_delete: bool = True) -> bool:
@@ -187,108 +1224,597 @@ class ABSClient:
             True if successful
         """
         params = {'hard': '1'} if hard_delete else {}
-        self._delete(f'/api/items/{library_item_id}', params=params)
+        self._delete(f'/api/items/{library_item_id}', library_item_id, params=params)
         return True
 
+    def delete_library_items_batch(self, library_item_ids: list, hard_delete: bool = True,
+                                   chunk_size: int = DEFAULT_DELETE_BATCH_SIZE) -> dict:
+        """
+        Delete several library items (audiobooks) using the batch-delete endpoint.
+
+        Items are sent in chunks of chunk_size. If the server rejects a batch
+        request, that chunk is deleted one item at a time instead. Items that
+        no longer exist count as deleted.
+
+        Args:
+            library_item_ids: The library item IDs to delete
+            hard_delete: If True, also delete the files from disk
+            chunk_size: Maximum number of items per batch request
+
+        Returns:
+            dict of library_item_id -> None if deleted, or the exception that
+            made the delete fail
+        """
+        results = {}
+        params = {'hard': '1'} if hard_delete else {}
+
+        for start in range(0, len(library_item_ids), chunk_size):
+            chunk = library_item_ids[start:start + chunk_size]
+            batch_not_found = False
+
+            if self.batch_delete_supported:
+                try:
+                    try:
+                        self._post('/api/items/batch/delete', json={'libraryItemIds': chunk}, params=params)
+                    finally:
+                        self.invalidate_library_items(chunk)
+                    results.update(dict.fromkeys(chunk))
+                    continue
+                except requests.exceptions.HTTPError as e:
+                    status = e.response.status_code if e.response is not None else None
+                    if status == 405:
+                        logger.debug("Batch delete not supported by server, deleting items individually")
+                        self.batch_delete_supported = False
+                    elif status == 404:
+                        # ABS also answers 404 when none of the items exist, so only
+                        # give up on batching if the items turn out to be there
+                        logger.debug("Batch delete returned 404, deleting items individually")
+                        batch_not_found = True
+                    else:
+                        logger.warning(f"Batch delete rejected ({e}), deleting items individually")
+                except Exception as e:
+                    # The batch may or may not have been applied, so don't retry it item by item
+                    results.update(dict.fromkeys(chunk, e))
+                    continue
+
+            all_gone = True
+            for library_item_id in chunk:
+                try:
+                    self.delete_library_item(library_item_id, hard_delete=hard_delete)
+                    results[library_item_id] = None
+                    all_gone = False
+                except requests.exceptions.HTTPError as e:
+                    if e.response is not None and e.response.status_code == 404:
+                        logger.debug(f"  {library_item_id} is already gone")
+                        results[library_item_id] = None
+                    else:
+                        results[library_item_id] = e
+                        all_gone = False
+                except Exception as e:
+                    results[library_item_id] = e
+                    all_gone = False
+
+            if batch_not_found and not all_gone:
+                logger.debug("Batch delete not supported by server, deleting items individually")
+                self.batch_delete_supported = False
+
+        return results
+
+
+class ItemCache:
+    """
+    On-disk SQLite cache of slimmed-down podcast items, keyed by library item ID.
+
+    Each entry remembers the item's updatedAt from the library listing; a
+    lookup only hits if updatedAt hasn't moved since the entry was stored.
+    The least recently used entries are evicted beyond max_items.
+    """
+
+    def __init__(self, path: str, max_items: int = DEFAULT_ITEM_CACHE_MAX_ITEMS):
+        self.path = path
+        self.max_items = max_items
+        self.hits = 0
+        self.misses = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.execute(
+            'CREATE TABLE IF NOT EXISTS items ('
+            ' id TEXT PRIMARY KEY, updated_at INTEGER NOT NULL, data TEXT NOT NULL, last_used REAL NOT NULL)'
+        )
+
+    def get(self, library_item_id: str, updated_at: int) -> dict | None:
+        """Return the cached slim item if it is still current, else None."""
+        row = self.db.execute('SELECT updated_at, data FROM items WHERE id = ?', (library_item_id,)).fetchone()
+        if row is None or updated_at is None or row[0] != updated_at:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.db.execute('UPDATE items SET last_used = ? WHERE id = ?', (time.time(), library_item_id))
+        return json.loads(row[1])
+
+    def put(self, library_item_id: str, updated_at: int, slim_item: dict):
+        """Store a slim item for the given updatedAt."""
+        if updated_at is None:
+            return
+        self.db.execute(
+            'INSERT OR REPLACE INTO items (id, updated_at, data, last_used) VALUES (?, ?, ?, ?)',
+            (library_item_id, updated_at, json.dumps(slim_item, separators=(',', ':')), time.time())
+        )
+
+    def flush(self):
+        """Evict least recently used entries beyond max_items and save."""
+        self.db.execute(
+            'DELETE FROM items WHERE id NOT IN (SELECT id FROM items ORDER BY last_used DESC LIMIT ?)',
+            (self.max_items,)
+        )
+        self.db.commit()
+
+    def close(self):
+        """Flush, then close the cache file."""
+        self.flush()
+        self.db.close()
+
+
+class ProgressState:
+    """
+    SQLite record of finished progress entries that earlier runs already handled.
+
+    filter_new() passes through only progress entries that are new, or whose
+    lastUpdate changed, since they were handled. mark_handled() records the
+    entries behind media that was deleted (or found to be gone), and close()
+    saves them, so anything skipped or failed is looked at again next run.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.unchanged = 0
+        self.pending = {}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.execute(
+            'CREATE TABLE IF NOT EXISTS progress (id TEXT PRIMARY KEY, last_update INTEGER)'
+        )
+
+    def filter_new(self, progress_records):
+        """
+        Yield the progress records that are new or changed since they were handled.
+
+        Keeps track of the yielded records so mark_handled() can record them
+        by episode or library item ID.
+        """
+        for progress in progress_records:
+            progress_id = progress.get('id')
+            last_update = progress.get('lastUpdate')
+            if progress_id is None:
+                yield progress
+                continue
+
+            row = self.db.execute('SELECT last_update FROM progress WHERE id = ?', (progress_id,)).fetchone()
+            if row is not None and row[0] == last_update:
+                self.unchanged += 1
+                continue
 
-def get_finished_media(user_data: dict) -> tuple[set, set]:
+            media_id = progress.get('episodeId') or progress.get('libraryItemId')
+            self.pending.setdefault(media_id, []).append((progress_id, last_update))
+            yield progress
+
+    def mark_handled(self, media_ids):
+        """Record the progress entries behind these episode or library item IDs as handled."""
+        for media_id in media_ids:
+            for progress_id, last_update in self.pending.pop(media_id, []):
+                self.db.execute(
+                    'INSERT OR REPLACE INTO progress (id, last_update) VALUES (?, ?)', (progress_id, last_update)
+                )
+
+    def close(self):
+        """Save handled entries and close the state file."""
+        self.db.commit()
+        self.db.close()
+
+
+def slim_podcast_item(full_item: dict) -> dict:
+    """Keep only the fields of a podcast item that the episode map needs."""
+    media = full_item.get('media', {})
+    return {
+        'media': {
+            'metadata': {'title': media.get('metadata', {}).get('title', 'Unknown Podcast')},
+            'tags': media.get('tags', []),
+            'episodes': [
+                {'id': episode.get('id'), 'title': episode.get('title', 'Unknown Episode'),
+                 'addedAt': episode.get('addedAt')}
+                for episode in media.get('episodes', [])
+            ]
+        }
+    }
+
+
+def get_finished_media(user_data) -> tuple[set, set, dict]:
     """
     Extract finished media from user's media progress.
 
+    Args:
+        user_data: The user dict from /api/me, or an iterable of mediaProgress
+                   records such as ABSClient.iter_finished_progress()
+
     Returns:
-        tuple of (finished_episode_ids, finished_audiobook_ids)
+        tuple of (finished_episode_ids, finished_audiobook_ids, finished_episodes_by_item)
         - finished_episode_ids: set of episode IDs (for podcasts)
         - finished_audiobook_ids: set of library item IDs (for audiobooks)
+        - finished_episodes_by_item: dict of podcast library item ID -> set of finished episode IDs
     """
     finished_episodes = set()
     finished_audiobooks = set()
+    finished_episodes_by_item = {}
+
+    progress_records = user_data.get('mediaProgress', []) if isinstance(user_data, dict) else user_data
 
-    for progress in user_data.get('mediaProgress', []):
+    for progress in progress_records:
         if progress.get('isFinished'):
             if progress.get('episodeId'):
                 # This is a podcast episode
                 finished_episodes.add(progress['episodeId'])
+                if progress.get('libraryItemId'):
+                    finished_episodes_by_item.setdefault(progress['libraryItemId'], set()).add(progress['episodeId'])
             elif progress.get('libraryItemId'):
                 # This is an audiobook (no episodeId means it's a book)
                 finished_audiobooks.add(progress['libraryItemId'])
 
-    return finished_episodes, finished_audiobooks
+    return finished_episodes, finished_audiobooks, finished_episodes_by_item
 
 
-def build_episode_map(client: ABSClient) -> dict:
+def select_users(users: list, names: list = None) -> list:
+    """
+    Pick the accounts whose progress counts in multi-user mode.
+
+    Disabled accounts are left out. With names, only those usernames are
+    kept (case-insensitive), and any name without an active account is warned about.
+    """
+    users = [user for user in users if user.get('isActive', True)]
+    if not names:
+        return users
+
+    wanted = {name.lower() for name in names}
+    users = [user for user in users if user.get('username', '').lower() in wanted]
+    for name in sorted(wanted - {user.get('username', '').lower() for user in users}):
+        logger.warning(f"MULTI_USER_NAMES: no active user named '{name}'")
+    return users
+
+
+def combine_finished_media(per_user: list, policy: str) -> tuple[set, set, dict]:
+    """
+    Combine several users' get_finished_media() results.
+
+    Args:
+        per_user: One (finished_episode_ids, finished_audiobook_ids, finished_episodes_by_item)
+                  tuple per user
+        policy: ANY keeps media finished by at least one user, ALL only media
+                finished by every user
+
+    Returns:
+        tuple of (finished_episode_ids, finished_audiobook_ids, finished_episodes_by_item),
+        as get_finished_media() does for a single user
+    """
+    if not per_user:
+        return set(), set(), {}
+
+    combine = set.union if policy == 'ANY' else set.intersection
+    finished_episodes = combine(*(episodes for episodes, _, _ in per_user))
+    finished_audiobooks = combine(*(audiobooks for _, audiobooks, _ in per_user))
+
+    finished_episodes_by_item = {}
+    for _, _, by_item in per_user:
+        for library_item_id, episode_ids in by_item.items():
+            episode_ids = episode_ids & finished_episodes
+            if episode_ids:
+                finished_episodes_by_item.setdefault(library_item_id, set()).update(episode_ids)
+
+    return finished_episodes, finished_audiobooks, finished_episodes_by_item
+
+
+def get_finished_media_for_users(client: ABSClient, policy: str, names: list = None, concurrency: int = 1,
+                                 state: ProgressState = None) -> tuple[set, set, dict]:
+    """
+    Collect finished media across user accounts (needs an admin token).
+
+    Each user's progress is fetched on a bounded worker pool, then the
+    users' finished sets are combined with combine_finished_media().
+
+    Args:
+        client: The ABS client to fetch with
+        policy: ANY or ALL, see combine_finished_media()
+        names: Optional usernames to restrict the combination to
+        concurrency: Maximum number of user fetches in flight at once
+        state: Optional delta-mode state to filter each user's progress through
+
+    Returns:
+        tuple of (finished_episode_ids, finished_audiobook_ids, finished_episodes_by_item)
     """
-    Build a mapping of episode_id -> (library_item_id, podcast_title, episode_title, added_at).
+    users = select_users(client.get_users(), names)
+    logger.info(f"Combining finished media of {len(users)} users ({policy} policy)")
 
-    Scans all podcast libraries and their episodes.
+    def fetch(user):
+        return user.get('username', user['id']), client.get_user(user['id'])
+
+    per_user = []
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(users)))) as executor:
+        for username, user_data in executor.map(fetch, users):
+            progress_records = (progress for progress in user_data.get('mediaProgress', [])
+                                if progress.get('isFinished'))
+            if state is not None:
+                progress_records = state.filter_new(progress_records)
+            finished = get_finished_media(progress_records)
+            logger.debug(f"  {username}: {len(finished[0])} episodes, {len(finished[1])} audiobooks finished")
+            per_user.append(finished)
+
+    return combine_finished_media(per_user, policy)
+
+
+def fetch_item_details(client: ABSClient, library_item_ids: list, concurrency: int = 1, get_item=None):
+    """
+    Fetch full details for several library items using a bounded worker pool.
+
+    Args:
+        client: The ABS client to fetch with
+        library_item_ids: Library item IDs to fetch
+        concurrency: Maximum number of requests in flight at once
+        get_item: Fetch function to use instead of client.get_library_item
+
+    Yields:
+        (library_item_id, full_item) tuples in the order of library_item_ids.
+        Items that fail to fetch are logged and skipped.
+    """
+    get_item = get_item or client.get_library_item
+
+    def fetch(library_item_id):
+        try:
+            return library_item_id, get_item(library_item_id)
+        except requests.exceptions.HTTPError as e:
+            if e.response is not None and e.response.status_code == 404:
+                logger.debug(f"  {library_item_id} no longer exists")
+            else:
+                logger.warning(f"Failed to fetch details for {library_item_id}: {e}")
+            return library_item_id, None
+        except Exception as e:
+            logger.warning(f"Failed to fetch details for {library_item_id}: {e}")
+            return library_item_id, None
+
+    if concurrency <= 1:
+        results = map(fetch, library_item_ids)
+        executor = None
+    else:
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+        results = executor.map(fetch, library_item_ids)
+
+    try:
+        for library_item_id, full_item in results:
+            if full_item is not None:
+                yield library_item_id, full_item
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+def build_episode_map(client: ABSClient, concurrency: int = 1, podcast_item_ids: set = None,
+                      server_filter: bool = False, item_cache: ItemCache = None, slim: bool = True) -> dict:
+    """
+    Build a mapping of episode_id -> EpisodeRecord.
+
+    Scans all podcast libraries and their episodes, fetching podcast details
+    with up to `concurrency` requests in flight. If podcast_item_ids is given,
+    only those podcasts are fetched; otherwise every podcast is.
+    With server_filter, the listing only asks ABS for podcasts with finished or
+    in-progress episodes.
+    With an item_cache, podcasts whose updatedAt hasn't changed since they
+    were cached are not fetched again.
+    With slim, podcasts are fetched with get_podcast_item_slim rather than
+    in expanded form.
     Skips podcasts that have a "KEEP" tag.
     """
     episode_map = {}
 
+    def add_entries(library_item_id, item):
+        entries = podcast_episode_entries(library_item_id, item)
+        if entries is not None:
+            episode_map.update(entries)
+
     for library in client.get_podcast_libraries():
         library_id = library['id']
         library_name = library['name']
         logger.info(f"Scanning podcast library: {library_name}")
 
-        items = client.get_library_items(library_id)
-        logger.debug(f"Found {len(items)} podcasts in library")
+        item_count = 0
+        item_ids = []
+        updated_at = {}
+        for item in iter_podcast_listing(client, library_id, server_filter):
+            item_count += 1
+            if podcast_item_ids is not None and item['id'] not in podcast_item_ids:
+                continue
 
-        for item in items:
-            library_item_id = item['id']
+            if item_cache is not None:
+                updated_at[item['id']] = item.get('updatedAt')
+                cached_item = item_cache.get(item['id'], item.get('updatedAt'))
+                if cached_item is not None:
+                    add_entries(item['id'], cached_item)
+                    continue
+
+            item_ids.append(item['id'])
+        logger.debug(f"Found {item_count} podcasts in library")
+        if podcast_item_ids is not None:
+            logger.debug(f"{len(item_ids)} podcasts with finished episodes need fetching")
+
+        # Fetch full item details to get episodes
+        get_item = client.get_podcast_item_slim if slim else client.get_library_item
+        for library_item_id, full_item in fetch_item_details(client, item_ids, concurrency, get_item):
+            if item_cache is not None:
+                if not slim:
+                    full_item = slim_podcast_item(full_item)
+                item_cache.put(library_item_id, updated_at.get(library_item_id), full_item)
+            add_entries(library_item_id, full_item)
 
-            # Fetch full item details to get episodes
-            try:
-                full_item = client.get_library_item(library_item_id)
-                media = full_item.get('media', {})
-            except Exception as e:
-                logger.warning(f"Failed to fetch details for {library_item_id}: {e}")
-                continue
+    return episode_map
 
-            podcast_title = media.get('metadata', {}).get('title', 'Unknown Podcast')
 
-            # Check for KEEP tag - skip this podcast if found
-            tags = media.get('tags', [])
-            if 'KEEP' in tags:
-                logger.info(f"  Skipping '{podcast_title}' - has KEEP tag")
-                continue
+def iter_podcast_listing(client: ABSClient, library_id: str, server_filter: bool = False):
+    """
+    Iterate over a podcast library's listing.
 
-            episodes = media.get('episodes', [])
+    With server_filter, only podcasts with finished or in-progress episodes
+    are requested, in minified form. Each podcast is yielded once.
+    """
+    if not server_filter:
+        yield from client.iter_library_items(library_id)
+        return
 
-            logger.debug(f"  {podcast_title}: {len(episodes)} episodes")
+    seen = set()
+    for value in PODCAST_PROGRESS_FILTERS:
+        for item in client.iter_library_items(library_id, item_filter=progress_filter(value), minified=True):
+            if item['id'] not in seen:
+                seen.add(item['id'])
+                yield item
 
-            for episode in episodes:
-                episode_id = episode.get('id')
-                episode_title = episode.get('title', 'Unknown Episode')
-                added_at = episode.get('addedAt')
 
-                if episode_id:
-                    episode_map[episode_id] = {
-                        'library_item_id': library_item_id,
-                        'podcast_title': podcast_title,
-                        'episode_title': episode_title,
-                        'added_at': added_at
-                    }
+def podcast_episode_entries(library_item_id: str, full_item: dict) -> dict | None:
+    """
+    Build the episode map entries for a fully fetched podcast library item.
 
-    return episode_map
+    Returns None (after logging) if the podcast has a "KEEP" tag.
+    """
+    media = full_item.get('media', {})
+    podcast_title = media.get('metadata', {}).get('title', 'Unknown Podcast')
 
+    # Check for KEEP tag - skip this podcast if found
+    tags = media.get('tags', [])
+    if 'KEEP' in tags:
+        logger.info(f"  Skipping '{podcast_title}' - has KEEP tag")
+        return None
 
-def build_audiobook_map(client: ABSClient, finished_audiobook_ids: set) -> dict:
+    episodes = media.get('episodes', [])
+
+    logger.debug(f"  {podcast_title}: {len(episodes)} episodes")
+
+    podcast = Podcast(library_item_id, podcast_title)
+    entries = {}
+    for episode in episodes:
+        episode_id = episode.get('id')
+        episode_title = episode.get('title', 'Unknown Episode')
+        added_at = episode.get('addedAt')
+
+        if episode_id:
+            entries[episode_id] = EpisodeRecord(episode_id, podcast, episode_title, added_at)
+
+    return entries
+
+
+def audiobook_entry(library_item_id: str, full_item: dict) -> dict | None:
+    """
+    Build the audiobook map entry for a fully fetched library item.
+
+    Returns None (after logging) if the audiobook has a "KEEP" tag.
+    """
+    media = full_item.get('media', {})
+    audiobook_title = media.get('metadata', {}).get('title', 'Unknown Audiobook')
+    author_name = media.get('metadata', {}).get('authorName', 'Unknown Author')
+
+    # Check for KEEP tag - skip this audiobook if found
+    tags = media.get('tags', [])
+    if 'KEEP' in tags:
+        logger.info(f"  Skipping '{audiobook_title}' - has KEEP tag")
+        return None
+
+    logger.debug(f"  Found finished audiobook: {audiobook_title}")
+
+    # Get addedAt from the full_item (library item level)
+    added_at = full_item.get('addedAt')
+
+    return {
+        'library_item_id': library_item_id,
+        'audiobook_title': audiobook_title,
+        'author_name': author_name,
+        'added_at': added_at
+    }
+
+
+def fetch_finished_audiobooks(client: ABSClient, library_item_ids: list, concurrency: int = 1):
+    """
+    Fetch full details for finished audiobooks by ID, without listing libraries.
+
+    Uses the batch-get endpoint when the server has it and falls back to
+    per-ID fetches otherwise.
+
+    Yields:
+        (library_item_id, full_item) tuples
+    """
+    for start in range(0, len(library_item_ids), BATCH_GET_SIZE):
+        chunk = library_item_ids[start:start + BATCH_GET_SIZE]
+
+        if client.batch_get_supported:
+            try:
+                for full_item in client.get_library_items_batch(chunk):
+                    yield full_item['id'], full_item
+                continue
+            except requests.exceptions.HTTPError as e:
+                if e.response is not None and e.response.status_code in (404, 405):
+                    logger.debug("Batch get not supported by server, fetching items individually")
+                    client.batch_get_supported = False
+                else:
+                    logger.warning(f"Batch get failed ({e}), fetching items individually")
+
+        yield from fetch_item_details(client, chunk, concurrency)
+
+
+def build_audiobook_map(client: ABSClient, finished_audiobook_ids: set, concurrency: int = 1,
+                        direct: bool = True, server_filter: bool = False) -> dict:
     """
     Build a mapping of library_item_id -> audiobook info for finished audiobooks.
 
     Only includes audiobooks that are in the finished set AND exist in a book library.
     Skips audiobooks that have a "KEEP" tag.
+
+    With direct=True only the finished items are fetched and their book library
+    membership is checked from each item's libraryId. Otherwise every book
+    library is listed and intersected with the finished set; with
+    server_filter the listing only contains finished items, in minified form.
     """
     audiobook_map = {}
+    book_libraries = client.get_book_libraries()
+
+    if direct:
+        book_library_ids = {library['id'] for library in book_libraries}
+        logger.info(f"Fetching {len(finished_audiobook_ids)} finished items from "
+                    f"{len(book_libraries)} audiobook libraries")
+
+        for library_item_id, full_item in fetch_finished_audiobooks(client, sorted(finished_audiobook_ids),
+                                                                    concurrency):
+            if full_item.get('libraryId') not in book_library_ids:
+                logger.debug(f"  {library_item_id} is not in an audiobook library")
+                continue
+
+            entry = audiobook_entry(library_item_id, full_item)
+            if entry is not None:
+                audiobook_map[library_item_id] = entry
 
-    for library in client.get_book_libraries():
+        return audiobook_map
+
+    for library in book_libraries:
         library_id = library['id']
         library_name = library['name']
         logger.info(f"Scanning audiobook library: {library_name}")
 
-        items = client.get_library_items(library_id)
-        logger.debug(f"Found {len(items)} audiobooks in library")
+        if server_filter:
+            listing = client.iter_library_items(library_id, item_filter=progress_filter('finished'), minified=True)
+        else:
+            listing = client.iter_library_items(library_id)
 
-        for item in items:
+        item_count = 0
+        for item in listing:
+            item_count += 1
             library_item_id = item['id']
 
             # Only process if this audiobook is in our finished set
@@ -298,36 +1824,162 @@ def build_audiobook_map(client: ABSClient, finished_audiobook_ids: set) -> dict:
             # Fetch full item details
             try:
                 full_item = client.get_library_item(library_item_id)
-                media = full_item.get('media', {})
             except Exception as e:
                 logger.warning(f"Failed to fetch details for {library_item_id}: {e}")
                 continue
 
-            audiobook_title = media.get('metadata', {}).get('title', 'Unknown Audiobook')
-            author_name = media.get('metadata', {}).get('authorName', 'Unknown Author')
+            entry = audiobook_entry(library_item_id, full_item)
+            if entry is not None:
+                audiobook_map[library_item_id] = entry
 
-            # Check for KEEP tag - skip this audiobook if found
-            tags = media.get('tags', [])
-            if 'KEEP' in tags:
-                logger.info(f"  Skipping '{audiobook_title}' - has KEEP tag")
-                continue
+        logger.debug(f"Found {item_count} audiobooks in library")
 
-            logger.debug(f"  Found finished audiobook: {audiobook_title}")
+    return audiobook_map
 
-            # Get addedAt from the full_item (library item level)
-            added_at = full_item.get('addedAt')
 
-            audiobook_map[library_item_id] = {
-                'library_item_id': library_item_id,
-                'audiobook_title': audiobook_title,
-                'author_name': author_name,
-                'added_at': added_at
-            }
+def delete_podcast_episodes(client: ABSClient, episodes: list) -> tuple[list, int]:
+    """
+    Delete episodes that all belong to one podcast, one after another.
 
-    return audiobook_map
+    Returns:
+        tuple of (deleted_episode_ids, failed_count)
+    """
+    deleted = []
+    failed = 0
+    for ep in episodes:
+        label = f"{ep.podcast_title} - {ep.episode_title}"
+        try:
+            logger.info(f"Deleting: {label}")
+            client.delete_episode(ep.library_item_id, ep.episode_id, hard_delete=True)
+            deleted.append(ep.episode_id)
+            logger.info(f"  ✓ Deleted successfully: {label}")
+        except requests.exceptions.HTTPError as e:
+            logger.error(f"  ✗ Failed to delete {label}: {e}")
+            failed += 1
+        except Exception as e:
+            logger.error(f"  ✗ Unexpected error deleting {label}: {e}")
+            failed += 1
+    return deleted, failed
+
+
+def delete_episodes(client: ABSClient, episodes_to_delete: list, concurrency: int = 1) -> tuple[list, int]:
+    """
+    Delete podcast episodes, running different podcasts in parallel.
 
+    ABS rewrites a podcast's episode list on every delete, so deletes within
+    one podcast stay sequential. At most `concurrency` podcasts are worked
+    on at once.
 
-def main():
+    Returns:
+        tuple of (deleted_episode_ids, failed_count)
+    """
+    episodes_by_podcast = {}
+    for ep in episodes_to_delete:
+        episodes_by_podcast.setdefault(ep.library_item_id, []).append(ep)
+
+    groups = list(episodes_by_podcast.values())
+    if concurrency <= 1 or len(groups) <= 1:
+        results = [delete_podcast_episodes(client, episodes) for episodes in groups]
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(lambda episodes: delete_podcast_episodes(client, episodes), groups))
+
+    return [episode_id for deleted, _ in results for episode_id in deleted], sum(failed for _, failed in results)
+
+
+def select_episodes_to_delete(finished_episode_ids: set, episode_map: dict,
+                              age_cutoff: int | None) -> tuple[list, int]:
+    """
+    Pick the finished episodes that still exist and pass the age filter.
+
+    Args:
+        finished_episode_ids: Finished episode IDs from the progress data
+        episode_map: episode_id -> EpisodeRecord
+        age_cutoff: Cutoff from age_cutoff_ms, or None for no age filter
+
+    Returns:
+        tuple of (episodes_to_delete, skipped_age_count)
+    """
+    candidates = [episode_map[episode_id] for episode_id in finished_episode_ids if episode_id in episode_map]
+    if age_cutoff is None:
+        return candidates, 0
+
+    episodes_to_delete, too_recent = split_by_age(candidates, [ep.added_at for ep in candidates], age_cutoff)
+    if logger.isEnabledFor(logging.DEBUG):
+        for ep in too_recent:
+            logger.debug(f"  Skipping '{ep.episode_title}' - too recent (added {format_added_at(ep.added_at)})")
+
+    return episodes_to_delete, len(too_recent)
+
+
+def select_audiobooks_to_delete(audiobook_map: dict, age_cutoff: int | None) -> tuple[dict, int]:
+    """
+    Apply the age filter to the finished audiobooks.
+
+    Args:
+        audiobook_map: library_item_id -> audiobook info
+        age_cutoff: Cutoff from age_cutoff_ms, or None for no age filter
+
+    Returns:
+        tuple of (audiobooks_to_delete, skipped_age_count)
+    """
+    if age_cutoff is None:
+        return audiobook_map, 0
+
+    candidates = list(audiobook_map.values())
+    old_enough, too_recent = split_by_age(candidates, [ab['added_at'] for ab in candidates], age_cutoff)
+    if logger.isEnabledFor(logging.DEBUG):
+        for ab in too_recent:
+            logger.debug(f"  Skipping '{ab['audiobook_title']}' - too recent (added {format_added_at(ab['added_at'])})")
+
+    return {ab['library_item_id']: ab for ab in old_enough}, len(too_recent)
+
+
+def finished_podcast_item_ids(finished_episode_ids: set, finished_episodes_by_item: dict) -> set | None:
+    """
+    Get the podcasts that own a finished episode.
+
+    Returns None, meaning every podcast must be scanned, if any finished
+    episode's progress lacks its libraryItemId.
+    """
+    if sum(len(ids) for ids in finished_episodes_by_item.values()) < len(finished_episode_ids):
+        logger.debug("Some finished episodes have no libraryItemId, scanning all podcasts")
+        return None
+    return set(finished_episodes_by_item)
+
+
+def log_summary(config: dict, total_deleted: int, total_failed: int, total_skipped_age: int):
+    """Log the end-of-run summary."""
+    logger.info("=" * 50)
+    summary_parts = [f"{total_deleted} deleted", f"{total_failed} failed"]
+    if config['min_age'] is not None:
+        summary_parts.append(f"{total_skipped_age} skipped (too recent)")
+    logger.info(f"Cleanup complete: {', '.join(summary_parts)}")
+    if config['dry_run']:
+        logger.info("(DRY RUN - no actual deletions were performed)")
+
+
+def log_throttle_stats(throttle: Throttle):
+    """Log the request rate and concurrency limits a throttle applied."""
+    if not throttle.requests:
+        return
+    parts = [f"{throttle.requests} requests"]
+    if throttle.max_rps:
+        parts.append(f"capped at {throttle.max_rps:g}/s")
+    if throttle.adaptive:
+        parts.append(f"concurrency limit {throttle.limit} "
+                     f"(ranged {throttle.lowest_limit}-{throttle.highest_limit} of {throttle.max_concurrency})")
+    if throttle.last_p95 is not None:
+        parts.append(f"p95 latency {throttle.last_p95 * 1000:.0f} ms")
+    logger.info(f"Throttle: {', '.join(parts)}")
+
+
+def load_config() -> dict:
+    """
+    Load and validate configuration from the environment.
+
+    Exits the process with an error message if anything is invalid.
+    """
     # Load configuration from environment
     base_url = os.environ.get('ABS_URL')
     token = os.environ.get('ABS_TOKEN')
@@ -381,27 +2033,309 @@ def main():
             sys.exit(1)
         logger.info(f"Age filter: only deleting items added {age_str} or more ago")
 
-    process_podcasts = media_type in ('PODCASTS', 'EVERYTHING')
-    process_audiobooks = media_type in ('AUDIOBOOKS', 'EVERYTHING')
+    # Concurrency for item detail fetches
+    concurrency_str = os.environ.get('ABS_CONCURRENCY', '').strip()
+    concurrency = DEFAULT_CONCURRENCY
+    if concurrency_str:
+        if not concurrency_str.isdigit() or int(concurrency_str) < 1:
+            logger.error(f"Invalid ABS_CONCURRENCY: '{concurrency_str}'. Must be a positive integer")
+            sys.exit(1)
+        concurrency = int(concurrency_str)
+    logger.debug(f"Concurrency: {concurrency}")
+
+    # Audiobook lookup strategy
+    audiobook_lookup = os.environ.get('AUDIOBOOK_LOOKUP', 'DIRECT').upper()
+    if audiobook_lookup not in ('DIRECT', 'SCAN'):
+        logger.error(f"Invalid AUDIOBOOK_LOOKUP: {audiobook_lookup}. Must be DIRECT or SCAN")
+        sys.exit(1)
+
+    # Number of podcasts to delete episodes from in parallel
+    delete_concurrency_str = os.environ.get('DELETE_CONCURRENCY', '').strip()
+    delete_concurrency = concurrency
+    if delete_concurrency_str:
+        if not delete_concurrency_str.isdigit() or int(delete_concurrency_str) < 1:
+            logger.error(f"Invalid DELETE_CONCURRENCY: '{delete_concurrency_str}'. Must be a positive integer")
+            sys.exit(1)
+        delete_concurrency = int(delete_concurrency_str)
+
+    # Chunk size for batch audiobook deletes
+    delete_batch_size_str = os.environ.get('DELETE_BATCH_SIZE', '').strip()
+    delete_batch_size = DEFAULT_DELETE_BATCH_SIZE
+    if delete_batch_size_str:
+        if not delete_batch_size_str.isdigit() or int(delete_batch_size_str) < 1:
+            logger.error(f"Invalid DELETE_BATCH_SIZE: '{delete_batch_size_str}'. Must be a positive integer")
+            sys.exit(1)
+        delete_batch_size = int(delete_batch_size_str)
+
+    # On-disk cache of podcast episode lists (optional)
+    item_cache_path = os.path.expanduser(os.environ.get('ITEM_CACHE_PATH', '').strip())
+    item_cache_max_str = os.environ.get('ITEM_CACHE_MAX_ITEMS', '').strip()
+    item_cache_max_items = DEFAULT_ITEM_CACHE_MAX_ITEMS
+    if item_cache_max_str:
+        if not item_cache_max_str.isdigit() or int(item_cache_max_str) < 1:
+            logger.error(f"Invalid ITEM_CACHE_MAX_ITEMS: '{item_cache_max_str}'. Must be a positive integer")
+            sys.exit(1)
+        item_cache_max_items = int(item_cache_max_str)
 
-    logger.info(f"Connecting to Audiobookshelf at {base_url}")
-    client = ABSClient(base_url, token, verify_ssl=verify_ssl)
+    # On-disk HTTP cache for conditional GETs (optional)
+    http_cache_path = os.path.expanduser(os.environ.get('HTTP_CACHE_PATH', '').strip())
+
+    # Fetch podcasts without the expanded details unless disabled
+    slim_fetch = os.environ.get('SLIM_FETCH', '1').lower() not in ('0', 'false', 'no')
+
+    # Server-side progress filtering of library listings
+    server_filter = os.environ.get('SERVER_FILTER', '').lower() in ('1', 'true', 'yes')
+
+    # Async pipeline (optional, needs aiohttp)
+    use_async = os.environ.get('ABS_ASYNC', '').lower() in ('1', 'true', 'yes')
+    if use_async and importlib.util.find_spec('aiohttp') is None:
+        logger.error("ABS_ASYNC requires the aiohttp package. Install it with: pip install aiohttp")
+        sys.exit(1)
+    if use_async:
+        for name in ASYNC_UNSUPPORTED_SETTINGS:
+            if os.environ.get(name, '').strip():
+                logger.warning(f"{name} is not supported with ABS_ASYNC and will be ignored")
+
+    # Combine the finished media of several users (optional, needs an admin token)
+    multi_user = os.environ.get('MULTI_USER', '').lower() in ('1', 'true', 'yes')
+    multi_user_policy = os.environ.get('MULTI_USER_POLICY', 'ANY').upper()
+    if multi_user_policy not in MULTI_USER_POLICIES:
+        logger.error(f"Invalid MULTI_USER_POLICY: {multi_user_policy}. Must be ANY or ALL")
+        sys.exit(1)
+    multi_user_names = [name.strip() for name in os.environ.get('MULTI_USER_NAMES', '').split(',') if name.strip()]
+    if multi_user:
+        users_desc = ', '.join(multi_user_names) if multi_user_names else 'all users'
+        logger.info(f"Multi-user mode: deleting media finished by {multi_user_policy.lower()} of {users_desc}")
+
+    # Retries of transient failures, and the circuit breaker (0 disables it)
+    retries_str = os.environ.get('ABS_RETRIES', '').strip()
+    retries = DEFAULT_RETRIES
+    if retries_str:
+        if not retries_str.isdigit():
+            logger.error(f"Invalid ABS_RETRIES: '{retries_str}'. Must be 0 or a positive integer")
+            sys.exit(1)
+        retries = int(retries_str)
+
+    backoff_str = os.environ.get('ABS_BACKOFF', '').strip()
+    backoff = DEFAULT_BACKOFF
+    if backoff_str:
+        try:
+            backoff = float(backoff_str)
+        except ValueError:
+            backoff = -1
+        if backoff <= 0:
+            logger.error(f"Invalid ABS_BACKOFF: '{backoff_str}'. Must be a positive number of seconds")
+            sys.exit(1)
+
+    breaker_threshold_str = os.environ.get('BREAKER_THRESHOLD', '').strip()
+    breaker_threshold = DEFAULT_BREAKER_THRESHOLD
+    if breaker_threshold_str:
+        if not breaker_threshold_str.isdigit():
+            logger.error(f"Invalid BREAKER_THRESHOLD: '{breaker_threshold_str}'. Must be 0 or a positive integer")
+            sys.exit(1)
+        breaker_threshold = int(breaker_threshold_str)
+
+    breaker_cooldown_str = os.environ.get('BREAKER_COOLDOWN', '').strip()
+    breaker_cooldown = DEFAULT_BREAKER_COOLDOWN
+    if breaker_cooldown_str:
+        if not breaker_cooldown_str.isdigit() or int(breaker_cooldown_str) < 1:
+            logger.error(f"Invalid BREAKER_COOLDOWN: '{breaker_cooldown_str}'. Must be a positive number of seconds")
+            sys.exit(1)
+        breaker_cooldown = int(breaker_cooldown_str)
+
+    # Request rate cap and adaptive concurrency (optional)
+    max_rps_str = os.environ.get('ABS_MAX_RPS', '').strip()
+    max_rps = None
+    if max_rps_str:
+        try:
+            max_rps = float(max_rps_str)
+        except ValueError:
+            max_rps = -1
+        if max_rps <= 0:
+            logger.error(f"Invalid ABS_MAX_RPS: '{max_rps_str}'. Must be a positive number of requests per second")
+            sys.exit(1)
+        logger.info(f"Rate limit: at most {max_rps:g} requests per second")
+    adaptive = os.environ.get('ABS_ADAPTIVE', '').lower() in ('1', 'true', 'yes')
+
+    # Connection pool size and timeouts
+    pool_size_str = os.environ.get('ABS_POOL_SIZE', '').strip()
+    pool_size = max(concurrency, delete_concurrency)
+    if pool_size_str:
+        if not pool_size_str.isdigit() or int(pool_size_str) < 1:
+            logger.error(f"Invalid ABS_POOL_SIZE: '{pool_size_str}'. Must be a positive integer")
+            sys.exit(1)
+        pool_size = int(pool_size_str)
+
+    timeout = []
+    for name, default in (('ABS_CONNECT_TIMEOUT', DEFAULT_CONNECT_TIMEOUT), ('ABS_READ_TIMEOUT', DEFAULT_READ_TIMEOUT)):
+        value_str = os.environ.get(name, '').strip()
+        if value_str and (not value_str.isdigit() or int(value_str) < 1):
+            logger.error(f"Invalid {name}: '{value_str}'. Must be a positive number of seconds")
+            sys.exit(1)
+        timeout.append(int(value_str) if value_str else default)
+    logger.debug(f"Connection pool size: {pool_size}, timeouts (connect, read): {tuple(timeout)}")
+
+    # HTTP/2 transport (optional, needs httpx with h2)
+    http2 = os.environ.get('ABS_HTTP2', '').lower() in ('1', 'true', 'yes')
+    if http2 and httpx is None:
+        logger.warning("ABS_HTTP2 needs the httpx package with HTTP/2 support "
+                       "(pip install \"httpx[http2]\"), falling back to HTTP/1.1")
+        http2 = False
+
+    # Compressed responses (disable on CPU-starved hosts)
+    compress = os.environ.get('ABS_COMPRESS', '1').lower() not in ('0', 'false', 'no')
+
+    # Delta mode state file (optional)
+    state_path = os.path.expanduser(os.environ.get('STATE_PATH', '').strip())
+    if state_path and use_async:
+        logger.warning("STATE_PATH is not supported with ABS_ASYNC and will be ignored")
+        state_path = ''
+    if state_path and multi_user and multi_user_policy == 'ALL':
+        # Unchanged progress is filtered out, so one user's old progress would veto every new finish
+        logger.warning("STATE_PATH is not supported with MULTI_USER_POLICY=ALL and will be ignored")
+        state_path = ''
+    if server_filter and multi_user:
+        # ABS evaluates progress filters against the token owner's progress only
+        logger.warning("SERVER_FILTER is not supported with MULTI_USER and will be ignored")
+        server_filter = False
+
+    return {
+        'base_url': base_url,
+        'token': token,
+        'dry_run': dry_run,
+        'verify_ssl': verify_ssl,
+        'min_age': min_age,
+        'concurrency': concurrency,
+        'audiobook_lookup': audiobook_lookup,
+        'server_filter': server_filter,
+        'delete_batch_size': delete_batch_size,
+        'delete_concurrency': delete_concurrency,
+        'item_cache_path': item_cache_path,
+        'item_cache_max_items': item_cache_max_items,
+        'http_cache_path': http_cache_path,
+        'slim_fetch': slim_fetch,
+        'state_path': state_path,
+        'use_async': use_async,
+        'multi_user': multi_user,
+        'multi_user_policy': multi_user_policy,
+        'multi_user_names': multi_user_names,
+        'retries': retries,
+        'backoff': backoff,
+        'breaker_threshold': breaker_threshold,
+        'breaker_cooldown': breaker_cooldown,
+        'max_rps': max_rps,
+        'adaptive': adaptive,
+        'pool_size': pool_size,
+        'timeout': tuple(timeout),
+        'http2': http2,
+        'compress': compress,
+        'process_podcasts': media_type in ('PODCASTS', 'EVERYTHING'),
+        'process_audiobooks': media_type in ('AUDIOBOOKS', 'EVERYTHING'),
+    }
+
+
+def create_client(config: dict, http_cache: HTTPCache = None) -> ABSClient:
+    """Create the ABSClient described by the config."""
+    breaker = None
+    if config['breaker_threshold']:
+        breaker = CircuitBreaker(config['breaker_threshold'], config['breaker_cooldown'])
+    throttle = None
+    if config['max_rps'] or config['adaptive']:
+        throttle = Throttle(config['max_rps'], max(config['concurrency'], config['delete_concurrency']),
+                            config['adaptive'])
+    return ABSClient(config['base_url'], config['token'], verify_ssl=config['verify_ssl'], http_cache=http_cache,
+                     retries=config['retries'], backoff=config['backoff'], breaker=breaker, throttle=throttle,
+                     pool_size=config['pool_size'], timeout=config['timeout'], http2=config['http2'],
+                     compress=config['compress'])
+
+
+def run_cleanup(client: ABSClient, config: dict, item_cache: ItemCache = None):
+    """
+    Run one cleanup pass: find finished media and delete it.
+
+    An item_cache passed in is used and flushed but left open, so a daemon
+    can keep it across cycles; otherwise one is opened from the config.
+    """
+    client.reset_stats()
+
+    # Delta mode: only look at progress that changed since it was last handled
+    state = ProgressState(config['state_path']) if config['state_path'] else None
+    try:
+        run_cleanup_pass(client, config, state, item_cache)
+    finally:
+        if state is not None:
+            state.close()
+
+    if client.retried or (client.breaker is not None and client.breaker.trips):
+        trips = client.breaker.trips if client.breaker is not None else 0
+        logger.info(f"Transient errors: {client.retried} requests retried, ABS paused {trips} times")
+
+    if client.http2 is not None:
+        versions = client.http2.http_versions
+        pool_parts = [f"{count} requests over {version}" for version, count in sorted(versions.items())]
+        if versions and 'HTTP/2' not in versions:
+            pool_parts.append("server did not offer HTTP/2")
+    else:
+        pool_parts = [f"{client.connections_opened} opened"]
+        if client.pool_full.count:
+            pool_parts.append(f"{client.pool_full.count} discarded (pool of {client.pool_size} full)")
+    if client.connection_errors:
+        pool_parts.append(f"{client.connection_errors} failed or timed out")
+    logger.info(f"Connections: {', '.join(pool_parts)}")
+
+    if client.transfer_stats:
+        wire = sum(stats[1] for stats in client.transfer_stats.values())
+        decompressed = sum(stats[2] for stats in client.transfer_stats.values())
+        saved = 1 - wire / decompressed if decompressed else 0
+        logger.info(f"Transfer: {wire / 1024:.0f} KiB received, {decompressed / 1024:.0f} KiB decompressed "
+                    f"({saved:.0%} saved by compression)")
+        for endpoint, (count, wire, decompressed) in sorted(client.transfer_stats.items()):
+            logger.info(f"  {endpoint}: {count} responses, {wire / 1024:.1f} KiB -> {decompressed / 1024:.1f} KiB")
+
+    if client.throttle is not None:
+        log_throttle_stats(client.throttle)
+
+    logger.debug(f"JSON decoding ({client.json_backend}):")
+    for endpoint, (count, seconds) in sorted(client.decode_stats.items()):
+        logger.debug(f"  {endpoint}: {count} responses, {seconds * 1000:.1f} ms")
+
+
+def run_cleanup_pass(client: ABSClient, config: dict, state: ProgressState = None, item_cache: ItemCache = None):
+    """Find finished media and delete it, recording handled progress in state if given."""
+    dry_run = config['dry_run']
+    concurrency = config['concurrency']
+    process_podcasts = config['process_podcasts']
+    process_audiobooks = config['process_audiobooks']
 
     # Get user's finished media
     logger.info("Fetching user progress data...")
     try:
-        user_data = client.get_user_with_progress()
+        if config['multi_user']:
+            finished_episode_ids, finished_audiobook_ids, finished_episodes_by_item = get_finished_media_for_users(
+                client, config['multi_user_policy'], config['multi_user_names'], concurrency, state)
+        else:
+            progress_records = client.iter_finished_progress()
+            if state is not None:
+                progress_records = state.filter_new(progress_records)
+            finished_episode_ids, finished_audiobook_ids, finished_episodes_by_item = get_finished_media(
+                progress_records)
     except requests.exceptions.HTTPError as e:
-        logger.error(f"Failed to authenticate. Check your API token. Error: {e}")
-        sys.exit(1)
+        if config['multi_user']:
+            raise ProgressFetchError(f"Failed to fetch user progress. MULTI_USER needs an admin API token. "
+                                     f"Error: {e}") from e
+        raise ProgressFetchError(f"Failed to authenticate. Check your API token. Error: {e}") from e
 
-    finished_episode_ids, finished_audiobook_ids = get_finished_media(user_data)
+    if state is not None:
+        logger.info(f"Delta mode: skipped {state.unchanged} finished items already handled in earlier runs")
 
     if process_podcasts:
         logger.info(f"Found {len(finished_episode_ids)} finished podcast episodes in progress data")
     if process_audiobooks:
         logger.info(f"Found {len(finished_audiobook_ids)} finished audiobooks in progress data")
 
+    # One age cutoff for the whole run
+    age_cutoff = age_cutoff_ms(config['min_age']) if config['min_age'] is not None else None
+
     # Track totals
     total_deleted = 0
     total_failed = 0
@@ -413,58 +2347,60 @@ def main():
         logger.info("PROCESSING PODCAST EPISODES")
         logger.info("=" * 50)
 
+        # Only podcasts owning a finished episode need their details fetched
+        podcast_item_ids = finished_podcast_item_ids(finished_episode_ids, finished_episodes_by_item)
+
         # Build map of all episodes across all podcast libraries
         logger.info("Building episode map from podcast libraries...")
-        episode_map = build_episode_map(client)
-        logger.info(f"Found {len(episode_map)} total episodes across all podcasts")
+        owns_item_cache = item_cache is None and bool(config['item_cache_path'])
+        if owns_item_cache:
+            item_cache = ItemCache(config['item_cache_path'], config['item_cache_max_items'])
+        try:
+            episode_map = build_episode_map(client, concurrency, podcast_item_ids, config['server_filter'],
+                                            item_cache, config['slim_fetch'])
+        finally:
+            if item_cache is not None:
+                logger.debug(f"Item cache: {item_cache.hits} hits, {item_cache.misses} misses")
+                if owns_item_cache:
+                    item_cache.close()
+                else:
+                    item_cache.flush()
+        logger.info(f"Found {len(episode_map)} total episodes across scanned podcasts")
 
         # Find finished episodes that still exist
-        episodes_to_delete = []
-        for episode_id in finished_episode_ids:
-            if episode_id in episode_map:
-                ep_data = episode_map[episode_id]
-
-                # Check age filter if configured
-                if min_age is not None:
-                    if not is_old_enough(ep_data.get('added_at'), min_age):
-                        added_at_str = "unknown"
-                        if ep_data.get('added_at'):
-                            added_at_dt = datetime.fromtimestamp(ep_data['added_at'] / 1000)
-                            added_at_str = added_at_dt.strftime('%Y-%m-%d')
-                        logger.debug(f"  Skipping '{ep_data['episode_title']}' - too recent (added {added_at_str})")
-                        total_skipped_age += 1
-                        continue
-
-                episodes_to_delete.append({
-                    'episode_id': episode_id,
-                    **ep_data
-                })
+        episodes_to_delete, skipped_age = select_episodes_to_delete(finished_episode_ids, episode_map, age_cutoff)
+        total_skipped_age += skipped_age
 
         if episodes_to_delete:
             logger.info(f"Found {len(episodes_to_delete)} finished episodes to delete:")
             for ep in episodes_to_delete:
-                logger.info(f"  - {ep['podcast_title']}: {ep['episode_title']}")
+                logger.info(f"  - {ep.podcast_title}: {ep.episode_title}")
 
             # Delete episodes
-            for ep in episodes_to_delete:
-                try:
-                    if dry_run:
-                        logger.info(f"[DRY RUN] Would delete: {ep['podcast_title']} - {ep['episode_title']}")
-                        total_deleted += 1
-                    else:
-                        logger.info(f"Deleting: {ep['podcast_title']} - {ep['episode_title']}")
-                        client.delete_episode(ep['library_item_id'], ep['episode_id'], hard_delete=True)
-                        total_deleted += 1
-                        logger.info(f"  ✓ Deleted successfully")
-                except requests.exceptions.HTTPError as e:
-                    logger.error(f"  ✗ Failed to delete: {e}")
-                    total_failed += 1
-                except Exception as e:
-                    logger.error(f"  ✗ Unexpected error: {e}")
-                    total_failed += 1
+            if dry_run:
+                for ep in episodes_to_delete:
+                    logger.info(f"[DRY RUN] Would delete: {ep.podcast_title} - {ep.episode_title}")
+                    total_deleted += 1
+            else:
+                deleted, failed = delete_episodes(client, episodes_to_delete, config['delete_concurrency'])
+                total_deleted += len(deleted)
+                total_failed += failed
+                if state is not None:
+                    state.mark_handled(deleted)
         else:
             logger.info("No finished podcast episodes found that need deletion")
 
+        if state is not None and not dry_run:
+            # Finished episodes missing from a podcast we did load are already gone
+            loaded_podcasts = {ep.library_item_id for ep in episode_map.values()}
+            state.mark_handled(
+                episode_id
+                for library_item_id, episode_ids in finished_episodes_by_item.items()
+                if library_item_id in loaded_podcasts
+                for episode_id in episode_ids
+                if episode_id not in episode_map
+            )
+
     # Process audiobooks
     if process_audiobooks and finished_audiobook_ids:
         logger.info("=" * 50)
@@ -473,24 +2409,14 @@ def main():
 
         # Build map of finished audiobooks that exist and don't have KEEP tag
         logger.info("Building audiobook map from book libraries...")
-        audiobook_map = build_audiobook_map(client, finished_audiobook_ids)
+        audiobook_map = build_audiobook_map(client, finished_audiobook_ids, concurrency,
+                                            direct=config['audiobook_lookup'] == 'DIRECT',
+                                            server_filter=config['server_filter'])
         logger.info(f"Found {len(audiobook_map)} finished audiobooks eligible for deletion")
 
         # Apply age filter if configured
-        audiobooks_to_delete = {}
-        if min_age is not None:
-            for lib_item_id, ab_data in audiobook_map.items():
-                if is_old_enough(ab_data.get('added_at'), min_age):
-                    audiobooks_to_delete[lib_item_id] = ab_data
-                else:
-                    added_at_str = "unknown"
-                    if ab_data.get('added_at'):
-                        added_at_dt = datetime.fromtimestamp(ab_data['added_at'] / 1000)
-                        added_at_str = added_at_dt.strftime('%Y-%m-%d')
-                    logger.debug(f"  Skipping '{ab_data['audiobook_title']}' - too recent (added {added_at_str})")
-                    total_skipped_age += 1
-        else:
-            audiobooks_to_delete = audiobook_map
+        audiobooks_to_delete, skipped_age = select_audiobooks_to_delete(audiobook_map, age_cutoff)
+        total_skipped_age += skipped_age
 
         if audiobooks_to_delete:
             logger.info(f"Audiobooks to delete:")
@@ -498,33 +2424,629 @@ def main():
                 logger.info(f"  - {ab['audiobook_title']} by {ab['author_name']}")
 
             # Delete audiobooks
-            for ab in audiobooks_to_delete.values():
-                try:
-                    if dry_run:
-                        logger.info(f"[DRY RUN] Would delete: {ab['audiobook_title']} by {ab['author_name']}")
+            if dry_run:
+                for ab in audiobooks_to_delete.values():
+                    logger.info(f"[DRY RUN] Would delete: {ab['audiobook_title']} by {ab['author_name']}")
+                    total_deleted += 1
+            else:
+                logger.info(f"Deleting {len(audiobooks_to_delete)} audiobooks...")
+                results = client.delete_library_items_batch(list(audiobooks_to_delete), hard_delete=True,
+                                                            chunk_size=config['delete_batch_size'])
+                for lib_item_id, error in results.items():
+                    ab = audiobooks_to_delete[lib_item_id]
+                    if error is None:
+                        logger.info(f"  ✓ Deleted: {ab['audiobook_title']} by {ab['author_name']}")
                         total_deleted += 1
+                        if state is not None:
+                            state.mark_handled([lib_item_id])
                     else:
-                        logger.info(f"Deleting: {ab['audiobook_title']} by {ab['author_name']}")
-                        client.delete_library_item(ab['library_item_id'], hard_delete=True)
-                        total_deleted += 1
-                        logger.info(f"  ✓ Deleted successfully")
-                except requests.exceptions.HTTPError as e:
-                    logger.error(f"  ✗ Failed to delete: {e}")
-                    total_failed += 1
-                except Exception as e:
-                    logger.error(f"  ✗ Unexpected error: {e}")
-                    total_failed += 1
+                        logger.error(f"  ✗ Failed to delete {ab['audiobook_title']}: {error}")
+                        total_failed += 1
         else:
             logger.info("No finished audiobooks found that need deletion")
 
-    # Summary
-    logger.info("=" * 50)
-    summary_parts = [f"{total_deleted} deleted", f"{total_failed} failed"]
-    if min_age is not None:
-        summary_parts.append(f"{total_skipped_age} skipped (too recent)")
-    logger.info(f"Cleanup complete: {', '.join(summary_parts)}")
-    if dry_run:
-        logger.info("(DRY RUN - no actual deletions were performed)")
+    log_summary(config, total_deleted, total_failed, total_skipped_age)
+
+
+class AsyncABSClient:
+    """
+    asyncio counterpart of ABSClient built on aiohttp.
+
+    All requests share one connection pool capped at `concurrency` connections.
+    Use as an async context manager so the pool is closed afterwards.
+    """
+
+    def __init__(self, base_url: str, token: str, verify_ssl: bool = True,
+                 concurrency: int = DEFAULT_CONCURRENCY,
+                 timeout: tuple = (DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT), compress: bool = True,
+                 throttle: AsyncThrottle = None):
+        self.base_url = base_url.rstrip('/')
+        self.verify_ssl = verify_ssl
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.throttle = throttle
+        self.headers = {
+            'Authorization': f'Bearer {token}',
+            'Content-Type': 'application/json'
+        }
+        if not compress:
+            self.headers['Accept-Encoding'] = 'identity'
+        self.session = None
+
+    async def __aenter__(self):
+        import aiohttp
+        connector = aiohttp.TCPConnector(limit=self.concurrency, ssl=None if self.verify_ssl else False)
+        connect_timeout, read_timeout = self.timeout
+        self.session = aiohttp.ClientSession(headers=self.headers, connector=connector,
+                                             timeout=aiohttp.ClientTimeout(sock_connect=connect_timeout,
+                                                                           sock_read=read_timeout))
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.session.close()
+
+    async def _request(self, method: str, endpoint: str, params: dict = None):
+        """Send a request through the throttle, if any, and return the decoded JSON of a GET."""
+        url = f"{self.base_url}{endpoint}"
+        started = await self.throttle.acquire() if self.throttle is not None else None
+        failed = True
+        try:
+            async with self.session.request(method, url, params=params) as response:
+                failed = response.status in RETRY_STATUSES
+                response.raise_for_status()
+                if method == 'GET':
+                    return await response.json()
+        finally:
+            if self.throttle is not None:
+                await self.throttle.release(started, failed)
+
+    async def _get(self, endpoint: str, params: dict = None) -> dict:
+        return await self._request('GET', endpoint, params)
+
+    async def _delete(self, endpoint: str, params: dict = None):
+        await self._request('DELETE', endpoint, params)
+
+    async def get_user_with_progress(self) -> dict:
+        """Get current user info including media progress."""
+        return await self._get('/api/me')
+
+    async def get_users(self) -> list:
+        """Get all user accounts (admin token required)."""
+        data = await self._get('/api/users')
+        return data.get('users', [])
+
+    async def get_user(self, user_id: str) -> dict:
+        """Get one user including their media progress (admin token required)."""
+        return await self._get(f'/api/users/{user_id}')
+
+    async def get_libraries(self) -> list:
+        """Get all libraries."""
+        data = await self._get('/api/libraries')
+        return data.get('libraries', [])
+
+    async def get_library_items(self, library_id: str, item_filter: str = None, minified: bool = False) -> list:
+        """Get all items in a library, optionally filtered server-side."""
+        return [item async for item in self.iter_library_items(library_id, item_filter=item_filter, minified=minified)]
+
+    async def iter_library_items(self, library_id: str, page_size: int = LIBRARY_PAGE_SIZE,
+                                 item_filter: str = None, minified: bool = False):
+        """Iterate over all items in a library, one page at a time."""
+        page = 0
+        seen = 0
+        while True:
+            data = await self._get(f'/api/libraries/{library_id}/items',
+                                   params=library_items_params(page, page_size, item_filter, minified))
+            results = data.get('results', [])
+            for item in results:
+                yield item
+
+            seen += len(results)
+            if len(results) < page_size or seen >= data.get('total', 0):
+                return
+            page += 1
+
+    async def get_library_item(self, library_item_id: str) -> dict:
+        """Get a single library item with full details including episodes."""
+        return await self._get(f'/api/items/{library_item_id}', params={'expanded': '1'})
+
+    async def get_podcast_item_slim(self, library_item_id: str) -> dict:
+        """Get a podcast with just the fields the episode map needs (see ABSClient)."""
+        item = await self._get(f'/api/items/{library_item_id}')
+        if 'episodes' not in item.get('media', {}):
+            item = await self.get_library_item(library_item_id)
+        return slim_podcast_item(item)
+
+    async def delete_episode(self, library_item_id: str, episode_id: str, hard_delete: bool = True) -> bool:
+        """Delete a podcast episode (and its file if hard_delete)."""
+        params = {'hard': '1'} if hard_delete else {}
+        await self._delete(f'/api/podcasts/{library_item_id}/episode/{episode_id}', params=params)
+        return True
+
+    async def delete_library_item(self, library_item_id: str, hard_delete: bool = True) -> bool:
+        """Delete a library item (and its files if hard_delete)."""
+        params = {'hard': '1'} if hard_delete else {}
+        await self._delete(f'/api/items/{library_item_id}', params=params)
+        return True
+
+
+async def async_fetch_item(client: AsyncABSClient, library_item_id: str, slim: bool = False) -> dict | None:
+    """Fetch full (or slim podcast) details for one item, logging and returning None on failure."""
+    import aiohttp
+    try:
+        if slim:
+            return await client.get_podcast_item_slim(library_item_id)
+        return await client.get_library_item(library_item_id)
+    except aiohttp.ClientResponseError as e:
+        if e.status == 404:
+            logger.debug(f"  {library_item_id} no longer exists")
+        else:
+            logger.warning(f"Failed to fetch details for {library_item_id}: {e}")
+    except Exception as e:
+        logger.warning(f"Failed to fetch details for {library_item_id}: {e}")
+    return None
+
+
+async def async_build_episode_map(client: AsyncABSClient, libraries: list, podcast_item_ids: set = None,
+                                  server_filter: bool = False, slim: bool = True) -> dict:
+    """
+    Async version of build_episode_map.
+
+    Lists all podcast libraries at once and fetches every matching podcast
+    concurrently, bounded by the client's connection pool.
+    """
+    async def library_item_ids(library):
+        logger.info(f"Scanning podcast library: {library['name']}")
+        if server_filter:
+            listings = [client.iter_library_items(library['id'], item_filter=progress_filter(value), minified=True)
+                        for value in PODCAST_PROGRESS_FILTERS]
+        else:
+            listings = [client.iter_library_items(library['id'])]
+        item_ids = {}
+        for listing in listings:
+            async for item in listing:
+                if podcast_item_ids is None or item['id'] in podcast_item_ids:
+                    item_ids[item['id']] = None
+        return list(item_ids)
+
+    podcast_libraries = [lib for lib in libraries if lib.get('mediaType') == 'podcast']
+    item_ids = [item_id for ids in await asyncio.gather(*map(library_item_ids, podcast_libraries))
+                for item_id in ids]
+
+    episode_map = {}
+    full_items = await asyncio.gather(*(async_fetch_item(client, item_id, slim) for item_id in item_ids))
+    for library_item_id, full_item in zip(item_ids, full_items):
+        if full_item is not None:
+            entries = podcast_episode_entries(library_item_id, full_item)
+            if entries is not None:
+                episode_map.update(entries)
+
+    return episode_map
+
+
+async def async_build_audiobook_map(client: AsyncABSClient, libraries: list, finished_audiobook_ids: set) -> dict:
+    """
+    Async version of build_audiobook_map (direct lookup).
+
+    Fetches every finished item concurrently and checks book library
+    membership from each item's libraryId.
+    """
+    book_library_ids = {lib['id'] for lib in libraries if lib.get('mediaType') == 'book'}
+    item_ids = sorted(finished_audiobook_ids)
+
+    audiobook_map = {}
+    full_items = await asyncio.gather(*(async_fetch_item(client, item_id) for item_id in item_ids))
+    for library_item_id, full_item in zip(item_ids, full_items):
+        if full_item is None or full_item.get('libraryId') not in book_library_ids:
+            continue
+        entry = audiobook_entry(library_item_id, full_item)
+        if entry is not None:
+            audiobook_map[library_item_id] = entry
+
+    return audiobook_map
+
+
+async def async_get_finished_media_for_users(client: AsyncABSClient, policy: str,
+                                             names: list = None) -> tuple[set, set, dict]:
+    """Async counterpart of get_finished_media_for_users(); the client's pool bounds the fetches."""
+    users = select_users(await client.get_users(), names)
+    logger.info(f"Combining finished media of {len(users)} users ({policy} policy)")
+
+    users_data = await asyncio.gather(*(client.get_user(user['id']) for user in users))
+    per_user = [get_finished_media(user_data) for user_data in users_data]
+    return combine_finished_media(per_user, policy)
+
+
+async def async_run_cleanup(config: dict):
+    """
+    Run one cleanup pass on the async pipeline.
+
+    Podcast and audiobook lookups run at the same time, and deletes for
+    different podcasts run concurrently while each podcast's own deletes
+    stay sequential.
+    """
+    import aiohttp
+    dry_run = config['dry_run']
+    age_cutoff = age_cutoff_ms(config['min_age']) if config['min_age'] is not None else None
+    process_podcasts = config['process_podcasts']
+    process_audiobooks = config['process_audiobooks']
+
+    throttle = None
+    if config['max_rps'] or config['adaptive']:
+        throttle = AsyncThrottle(config['max_rps'], config['concurrency'], config['adaptive'])
+
+    async with AsyncABSClient(config['base_url'], config['token'], verify_ssl=config['verify_ssl'],
+                              concurrency=config['concurrency'], timeout=config['timeout'],
+                              compress=config['compress'], throttle=throttle) as client:
+        logger.info("Fetching user progress data...")
+        try:
+            if config['multi_user']:
+                finished_episode_ids, finished_audiobook_ids, finished_episodes_by_item = \
+                    await async_get_finished_media_for_users(client, config['multi_user_policy'],
+                                                             config['multi_user_names'])
+            else:
+                user_data = await client.get_user_with_progress()
+                finished_episode_ids, finished_audiobook_ids, finished_episodes_by_item = get_finished_media(
+                    user_data)
+        except aiohttp.ClientResponseError as e:
+            if config['multi_user']:
+                raise ProgressFetchError(f"Failed to fetch user progress. MULTI_USER needs an admin API token. "
+                                         f"Error: {e}") from e
+            raise ProgressFetchError(f"Failed to authenticate. Check your API token. Error: {e}") from e
+
+        if process_podcasts:
+            logger.info(f"Found {len(finished_episode_ids)} finished podcast episodes in progress data")
+        if process_audiobooks:
+            logger.info(f"Found {len(finished_audiobook_ids)} finished audiobooks in progress data")
+
+        libraries = await client.get_libraries()
+
+        async def no_items():
+            return {}
+
+        if process_podcasts and finished_episode_ids:
+            podcast_item_ids = finished_podcast_item_ids(finished_episode_ids, finished_episodes_by_item)
+            episode_lookup = async_build_episode_map(client, libraries, podcast_item_ids, config['server_filter'],
+                                                     config['slim_fetch'])
+        else:
+            episode_lookup = no_items()
+
+        if process_audiobooks and finished_audiobook_ids:
+            audiobook_lookup = async_build_audiobook_map(client, libraries, finished_audiobook_ids)
+        else:
+            audiobook_lookup = no_items()
+
+        episode_map, audiobook_map = await asyncio.gather(episode_lookup, audiobook_lookup)
+
+        episodes_to_delete, skipped_episodes = select_episodes_to_delete(finished_episode_ids, episode_map, age_cutoff)
+        audiobooks_to_delete, skipped_audiobooks = select_audiobooks_to_delete(audiobook_map, age_cutoff)
+        total_skipped_age = skipped_episodes + skipped_audiobooks
+
+        async def delete(label, delete_call):
+            if dry_run:
+                logger.info(f"[DRY RUN] Would delete: {label}")
+                return True
+            try:
+                await delete_call()
+                logger.info(f"Deleted: {label}")
+                return True
+            except aiohttp.ClientResponseError as e:
+                logger.error(f"  ✗ Failed to delete {label}: {e}")
+            except Exception as e:
+                logger.error(f"  ✗ Unexpected error deleting {label}: {e}")
+            return False
+
+        async def delete_podcast_group(episodes):
+            # ABS rewrites the podcast's episode list on every delete, so keep
+            # deletes within one podcast sequential
+            results = []
+            for ep in episodes:
+                results.append(await delete(
+                    f"{ep.podcast_title} - {ep.episode_title}",
+                    lambda ep=ep: client.delete_episode(ep.library_item_id, ep.episode_id, hard_delete=True)))
+            return results
+
+        episodes_by_podcast = {}
+        for ep in episodes_to_delete:
+            episodes_by_podcast.setdefault(ep.library_item_id, []).append(ep)
+
+        logger.info(f"Deleting {len(episodes_to_delete)} episodes and {len(audiobooks_to_delete)} audiobooks...")
+        results = await asyncio.gather(
+            *(delete_podcast_group(episodes) for episodes in episodes_by_podcast.values()),
+            *(delete(f"{ab['audiobook_title']} by {ab['author_name']}",
+                     lambda ab=ab: client.delete_library_item(ab['library_item_id'], hard_delete=True))
+              for ab in audiobooks_to_delete.values()))
+
+        outcomes = [ok for result in results for ok in (result if isinstance(result, list) else [result])]
+        log_summary(config, outcomes.count(True), outcomes.count(False), total_skipped_age)
+        if throttle is not None:
+            log_throttle_stats(throttle)
+
+
+class ProgressListener:
+    """
+    Deletes media as soon as ABS reports it finished over its socket.io connection.
+
+    Subscribes to user_item_progress_updated events; when a progress record
+    turns isFinished, just that episode or audiobook is fetched, checked for
+    the KEEP tag and age filter, and deleted. Nothing is polled or scanned.
+    Items too recent for the age filter are left for a regular run to pick up.
+    handle_progress_event() does not depend on the socket, so it can be
+    driven by any event source.
+    """
+
+    def __init__(self, client: ABSClient, config: dict):
+        self.client = client
+        self.config = config
+        self.handled = set()
+        self.deleted = 0
+        self.failed = 0
+        # Events can arrive on several threads; handle one at a time so repeated
+        # events for the same item and deletes within one podcast don't overlap
+        self.lock = threading.Lock()
+
+    def handle_progress_event(self, payload: dict):
+        """Handle one user_item_progress_updated event payload."""
+        with self.lock:
+            self._handle_progress_event(payload)
+
+    def _handle_progress_event(self, payload: dict):
+        progress = payload.get('data') or payload
+        if not progress.get('isFinished'):
+            return
+
+        library_item_id = progress.get('libraryItemId')
+        episode_id = progress.get('episodeId')
+        media_id = episode_id or library_item_id
+        if not library_item_id or media_id in self.handled:
+            return
+
+        try:
+            if episode_id:
+                if self.config['process_podcasts']:
+                    self.handle_finished_episode(library_item_id, episode_id)
+            elif self.config['process_audiobooks']:
+                self.handle_finished_audiobook(library_item_id)
+        except requests.exceptions.HTTPError as e:
+            logger.error(f"  ✗ Failed to handle finished {media_id}: {e}")
+            self.failed += 1
+            return
+        except Exception as e:
+            logger.error(f"  ✗ Unexpected error handling finished {media_id}: {e}")
+            self.failed += 1
+            return
+
+        self.handled.add(media_id)
+
+    def is_old_enough(self, added_at: int | None, label: str) -> bool:
+        min_age = self.config['min_age']
+        if min_age is None or is_old_enough(added_at, min_age):
+            return True
+        logger.info(f"  Skipping '{label}' - too recent (added {format_added_at(added_at)})")
+        return False
+
+    def handle_finished_episode(self, library_item_id: str, episode_id: str):
+        if self.config['slim_fetch']:
+            item = self.client.get_podcast_item_slim(library_item_id)
+        else:
+            item = self.client.get_library_item(library_item_id)
+
+        entries = podcast_episode_entries(library_item_id, item)
+        if entries is None or episode_id not in entries:
+            return
+
+        ep = entries[episode_id]
+        label = f"{ep.podcast_title} - {ep.episode_title}"
+        if not self.is_old_enough(ep.added_at, ep.episode_title):
+            return
+
+        if self.config['dry_run']:
+            logger.info(f"[DRY RUN] Would delete: {label}")
+        else:
+            logger.info(f"Deleting: {label}")
+            self.client.delete_episode(library_item_id, episode_id, hard_delete=True)
+            logger.info(f"  ✓ Deleted successfully: {label}")
+        self.deleted += 1
+
+    def handle_finished_audiobook(self, library_item_id: str):
+        item = self.client.get_library_item(library_item_id)
+        if item.get('mediaType') != 'book':
+            return
+
+        ab = audiobook_entry(library_item_id, item)
+        if ab is None:
+            return
+
+        label = f"{ab['audiobook_title']} by {ab['author_name']}"
+        if not self.is_old_enough(ab['added_at'], ab['audiobook_title']):
+            return
+
+        if self.config['dry_run']:
+            logger.info(f"[DRY RUN] Would delete: {label}")
+        else:
+            logger.info(f"Deleting: {label}")
+            self.client.delete_library_item(library_item_id, hard_delete=True)
+            logger.info(f"  ✓ Deleted successfully: {label}")
+        self.deleted += 1
+
+    def run(self, socket_url: str = None):
+        """
+        Connect to the ABS socket and handle progress events until disconnected.
+
+        Args:
+            socket_url: Server to connect to instead of ABS_URL, e.g. a local
+                        test server; its path is used as the socket.io prefix
+        """
+        import socketio
+
+        parsed = urlparse(socket_url or self.config['base_url'])
+        server_url = f"{parsed.scheme}://{parsed.netloc}"
+        socketio_path = f"{parsed.path.rstrip('/')}/socket.io"
+
+        sio = socketio.Client(reconnection=True, ssl_verify=self.config['verify_ssl'])
+
+        @sio.event
+        def connect():
+            logger.info("Connected to Audiobookshelf socket, authenticating...")
+            sio.emit('auth', self.config['token'])
+
+        @sio.event
+        def disconnect(*args):
+            logger.warning("Disconnected from Audiobookshelf socket")
+
+        @sio.on('auth_failed')
+        def auth_failed(*args):
+            logger.error("Socket authentication failed. Check your API token.")
+            sio.disconnect()
+
+        @sio.on('init')
+        def init(*args):
+            logger.info("Listening for finished items...")
+
+        @sio.on('user_item_progress_updated')
+        def progress_updated(payload):
+            self.handle_progress_event(payload)
+
+        sio.connect(server_url, socketio_path=socketio_path, transports=['websocket'])
+        try:
+            sio.wait()
+        except KeyboardInterrupt:
+            sio.disconnect()
+        finally:
+            logger.info(f"Listener stopped: {self.deleted} deleted, {self.failed} failed")
+
+
+def run_daemon(run_cycle, interval_minutes: int):
+    """
+    Call run_cycle every interval_minutes until SIGTERM or SIGINT.
+
+    A failing cycle is logged and the next one still runs on schedule.
+    """
+    stop = threading.Event()
+
+    def request_stop(signum, frame):
+        logger.info(f"Received signal {signum}, stopping after the current cycle")
+        stop.set()
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+
+    logger.info(f"Daemon mode: running cleanup every {interval_minutes} minutes")
+    while not stop.is_set():
+        started = time.monotonic()
+        try:
+            run_cycle()
+        except Exception as e:
+            logger.error(f"Cleanup cycle failed: {e}")
+
+        elapsed = time.monotonic() - started
+        stop.wait(max(0.0, interval_minutes * 60 - elapsed))
+
+    logger.info("Daemon stopped")
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Delete finished podcast episodes and audiobooks from Audiobookshelf. "
+                    "Configuration is read from environment variables (see the module docstring)."
+    )
+    parser.add_argument('--daemon', action='store_true',
+                        help="keep running and clean up on a schedule instead of exiting after one pass")
+    parser.add_argument('--listen', action='store_true',
+                        help="delete items as soon as ABS reports them finished over its socket (needs python-socketio)")
+    parser.add_argument('--no-compress', action='store_true',
+                        help="ask ABS for uncompressed responses, saving CPU at the cost of bandwidth "
+                             "(same as ABS_COMPRESS=0)")
+    parser.add_argument('--interval', type=int, metavar='MINUTES',
+                        help=f"minutes between cleanups in daemon mode "
+                             f"(default: DAEMON_INTERVAL or {DEFAULT_DAEMON_INTERVAL_MINUTES})")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    config = load_config()
+    if args.no_compress:
+        config['compress'] = False
+
+    daemon = args.daemon or os.environ.get('DAEMON', '').lower() in ('1', 'true', 'yes')
+    interval = args.interval
+    if interval is None:
+        interval_str = os.environ.get('DAEMON_INTERVAL', '').strip()
+        interval = DEFAULT_DAEMON_INTERVAL_MINUTES
+        if interval_str:
+            if not interval_str.isdigit():
+                logger.error(f"Invalid DAEMON_INTERVAL: '{interval_str}'. Must be a positive number of minutes")
+                sys.exit(1)
+            interval = int(interval_str)
+    if interval < 1:
+        logger.error("The daemon interval must be at least 1 minute")
+        sys.exit(1)
+
+    if args.listen:
+        if importlib.util.find_spec('socketio') is None:
+            logger.error("--listen requires the python-socketio package. "
+                         "Install it with: pip install \"python-socketio[client]\"")
+            sys.exit(1)
+        logger.info(f"Connecting to Audiobookshelf at {config['base_url']}")
+        if config['multi_user']:
+            logger.warning("MULTI_USER is ignored by --listen; ABS only sends the token owner's progress events")
+        client = create_client(config)
+        try:
+            ProgressListener(client, config).run(os.environ.get('ABS_SOCKET_URL') or None)
+        finally:
+            client.close()
+        return
+
+    if config['use_async']:
+        logger.info(f"Connecting to Audiobookshelf at {config['base_url']} (async)")
+        if daemon:
+            logger.warning("With ABS_ASYNC, connections are re-opened on every daemon cycle")
+            run_daemon(lambda: asyncio.run(async_run_cleanup(config)), interval)
+        else:
+            try:
+                asyncio.run(async_run_cleanup(config))
+            except ProgressFetchError as e:
+                logger.error(str(e))
+                sys.exit(1)
+        return
+
+    http_cache = None
+    if config['http_cache_path']:
+        http_cache = HTTPCache(config['http_cache_path'])
+
+    # In daemon mode podcast structure stays cached between cycles, in memory
+    # unless an on-disk cache is configured
+    item_cache = None
+    if daemon:
+        item_cache = ItemCache(config['item_cache_path'] or ':memory:', config['item_cache_max_items'])
+
+    logger.info(f"Connecting to Audiobookshelf at {config['base_url']}")
+    client = create_client(config, http_cache)
+
+    def run_cycle():
+        # Keep the library list between cycles, but refresh it now and then
+        client.invalidate_cache(older_than=LIBRARY_CACHE_TTL)
+        run_cleanup(client, config, item_cache)
+        if http_cache is not None:
+            http_cache.flush()
+
+    try:
+        if daemon:
+            run_daemon(run_cycle, interval)
+        else:
+            run_cleanup(client, config)
+    except ProgressFetchError as e:
+        logger.error(str(e))
+        sys.exit(1)
+    finally:
+        client.close()
+        if item_cache is not None:
+            item_cache.close()
+        if http_cache is not None:
+            logger.debug(f"HTTP cache: {http_cache.revalidated} responses revalidated, "
+                         f"{http_cache.stored} stored")
+            http_cache.close()
 
 
 if __name__ == '__main__':